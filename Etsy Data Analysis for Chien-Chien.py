@@ -46,8 +46,8 @@
 # In[1]:
 
 
-import sys
-get_ipython().system('{sys.executable} -m pip install altair vega_datasets')
+# install the chart dependency once, if it is missing:
+# !{sys.executable} -m pip install altair vega_datasets
 
 
 # In[1]:
@@ -55,16 +55,16 @@ get_ipython().system('{sys.executable} -m pip install altair vega_datasets')
 
 # import necessary libraries
 import pandas as pd
-import altair as alt
 import json as json
 import numpy as np
+from chienchien import AREAS_OF_INTEREST, brand_price_chart, combined_price_mean, leaf_segments, load_cached, segment_masks, segment_price_stats
 
 
 # In[2]:
 
 
-# read in the data set
-etsy = pd.read_json('etsy.json')
+# read in the cleaned data set, reusing the columnar cache when 'etsy.json' has not changed
+etsy = load_cached('etsy.json', normalized=True)
 etsy
 
 
@@ -80,26 +80,29 @@ etsy.info()
 etsy.describe()
 
 
-# Given the analysis does not require all of the columns, three will be removed, which are "availability", "images", and "scraped_at".
+# Given the analysis does not require all of the columns, three are never loaded, which are "availability", "images", and "scraped_at"; *load_cached* only keeps "description", "product_details", "brand", "price", "category", "average_rating" and "reviews_count".
 
-# In[5]:
+# With the original data set being a "json" file, there's some odd text in the "product_details"; these weird "\n\n\n\n\n\n" are replaced by a simple ", " (*clean_etsy*) before the cleaned data set is cached, so they are already gone above.
 
+# ## Exploratory Data Analysis
 
-etsy = etsy.drop(columns=['availability', 'images', 'scraped_at'])
-etsy
+# Every area of interest (and its sub-categories) is matched in a single pass over the "description" and "product_details" columns; each dataframe below is then filtered by its column of *segment_masks*. Matching ignores case, accents and extra whitespace, so "gift", "Gift" and "GIFT" all count; some counts are therefore higher than with exact, case-sensitive filters.
 
+# In[7]:
 
-# With the original data set being a "json" file, there's some odd text in the "product_details"; these weird "\n\n\n\n\n\n" will be replaced by a simple ", ".
 
-# In[6]:
+segments = segment_masks(etsy, normalized=True)
+segments.sum()
 
 
-# replace the '\n\n\n\n\n\n' with ', '
-etsy['product_details'] = etsy['product_details'].str.replace('\n\n\n\n\n\n', ', ')
-etsy
+# The price count, mean, standard deviation, min and max of every area of interest are computed together from the same segments.
 
+# In[7]:
+
+
+price_stats = segment_price_stats(etsy, segments)
+price_stats
 
-# ## Exploratory Data Analysis
 
 # ### "Gift" Main Category
 
@@ -107,7 +110,7 @@ etsy
 
 
 # Find the rows with the word 'Gift' in the "description" column
-etsy_gift = etsy[etsy['description'].str.contains('Gift')]
+etsy_gift = etsy[segments['gift']]
 etsy_gift
 
 
@@ -130,7 +133,7 @@ etsy_gift.describe()
 # In[11]:
 
 
-etsy_gift_painting = etsy_gift[etsy_gift['description'].str.contains('Painting')]
+etsy_gift_painting = etsy[segments['gift_painting']]
 etsy_gift_painting
 
 
@@ -149,7 +152,7 @@ etsy_gift_painting.describe()
 # In[16]:
 
 
-etsy_gift_painting_pricemean = 95.87
+etsy_gift_painting_pricemean = price_stats.loc['gift_painting', 'mean']
 etsy_gift_painting_pricemean
 
 
@@ -161,14 +164,7 @@ etsy_gift_painting_pricemean
 
 
 # create a Bar Chart with each brand as X and price as Y
-etsy_gift_painting_bar = alt.Chart(etsy_gift_painting).mark_bar().encode(
-    alt.X('brand'),
-    alt.Y('price', stack=False),
-    alt.Opacity('count()'),
-    tooltip=['price', 'count()']
-    ).configure_mark(
-    opacity=0.8,
-    color='purple')
+etsy_gift_painting_bar = brand_price_chart(etsy_gift_painting, color='purple', opacity=0.8)
 
 etsy_gift_painting_bar
 
@@ -249,7 +245,7 @@ etsy_gift_painting_brand
 # In[21]:
 
 
-etsy_gift_paper = etsy_gift[etsy_gift['description'].str.contains('Paper')]
+etsy_gift_paper = etsy[segments['gift_paper']]
 etsy_gift_paper
 
 
@@ -268,7 +264,7 @@ etsy_gift_paper.describe()
 # In[24]:
 
 
-etsy_gift_paper_pricemean = 48.55
+etsy_gift_paper_pricemean = price_stats.loc['gift_paper', 'mean']
 etsy_gift_paper_pricemean
 
 
@@ -280,11 +276,7 @@ etsy_gift_paper_pricemean
 
 
 # create a Bar Chart with each brand as X and price as Y
-etsy_gift_paper_bar = alt.Chart(etsy_gift_paper).mark_bar().encode(
-    alt.X('brand'),
-    alt.Y('price', stack=False),
-    tooltip=['price']
-    )
+etsy_gift_paper_bar = brand_price_chart(etsy_gift_paper)
 
 etsy_gift_paper_bar
 
@@ -340,7 +332,7 @@ etsy_gift_paper_brand
 # In[29]:
 
 
-etsy_decor = etsy[etsy['description'].str.contains('Decor')]
+etsy_decor = etsy[segments['decor']]
 etsy_decor
 
 
@@ -363,7 +355,7 @@ etsy_decor.describe()
 # In[32]:
 
 
-etsy_decor_painting = etsy_decor[etsy_decor['description'].str.contains('Painting')]
+etsy_decor_painting = etsy[segments['decor_painting']]
 etsy_decor_painting
 
 
@@ -382,7 +374,7 @@ etsy_decor_painting.describe()
 # In[35]:
 
 
-etsy_decor_painting_pricemean = 64.59
+etsy_decor_painting_pricemean = price_stats.loc['decor_painting', 'mean']
 etsy_decor_painting_pricemean
 
 
@@ -394,15 +386,7 @@ etsy_decor_painting_pricemean
 
 
 # create a Bar Chart with each brand as X and price as Y
-etsy_decor_painting_bar = alt.Chart(etsy_decor_painting).mark_bar().encode(
-    alt.X('brand'),
-    alt.Y('price', stack=False),
-    alt.Opacity('count()'),
-    tooltip=['price', 'count()']
-    ).configure_mark(
-    opacity=0.8,
-    color='purple'
-    )
+etsy_decor_painting_bar = brand_price_chart(etsy_decor_painting, color='purple', opacity=0.8)
 
 etsy_decor_painting_bar
 
@@ -466,7 +450,7 @@ etsy_decor_painting_brand
 # In[40]:
 
 
-etsy_decor_paper = etsy_decor[etsy_decor['description'].str.contains('Paper')]
+etsy_decor_paper = etsy[segments['decor_paper']]
 etsy_decor_paper
 
 
@@ -485,7 +469,7 @@ etsy_decor_paper.describe()
 # In[43]:
 
 
-etsy_decor_paper_pricemean = 23.20
+etsy_decor_paper_pricemean = price_stats.loc['decor_paper', 'mean']
 etsy_decor_paper_pricemean
 
 
@@ -497,14 +481,7 @@ etsy_decor_paper_pricemean
 
 
 #create a Bar Chart with each brand as X and price as Y
-etsy_decor_paper_bar = alt.Chart(etsy_decor_paper).mark_bar().encode(
-    alt.X('brand'),
-    alt.Y('price', stack=False),
-    alt.Opacity('count()'),
-    tooltip=['price', 'count()']
-    ).configure_mark(
-    color='purple'
-    )
+etsy_decor_paper_bar = brand_price_chart(etsy_decor_paper, color='purple')
 
 etsy_decor_paper_bar
 
@@ -572,7 +549,7 @@ etsy_decor_paper_brand
 
 
 # find Chinese in description
-etsy_chinese = etsy[etsy['description'].str.contains('Chinese')]
+etsy_chinese = etsy[segments['chinese']]
 etsy_chinese
 
 
@@ -591,7 +568,7 @@ etsy_chinese.describe()
 # In[51]:
 
 
-etsy_chinese_pricemean = 49.16
+etsy_chinese_pricemean = price_stats.loc['chinese', 'mean']
 etsy_chinese_pricemean
 
 
@@ -603,14 +580,7 @@ etsy_chinese_pricemean
 
 
 # create a Bar Chart with each brand as X and price as Y
-etsy_chinese_bar = alt.Chart(etsy_chinese).mark_bar().encode(
-    alt.X('brand'),
-    alt.Y('price', stack=False),
-    alt.Opacity('count()'),
-    tooltip=['price', 'count()']
-    ).configure_mark(
-    color='purple'
-    )
+etsy_chinese_bar = brand_price_chart(etsy_chinese, color='purple')
 
 etsy_chinese_bar
 
@@ -689,7 +659,7 @@ etsy_chinese_brand
 
 
 # Find Japanese in description
-etsy_japanese = etsy[etsy['description'].str.contains('Japanese')]
+etsy_japanese = etsy[segments['japanese']]
 etsy_japanese
 
 
@@ -708,7 +678,7 @@ etsy_japanese.describe()
 # In[59]:
 
 
-etsy_japanese_pricemean = 109.86
+etsy_japanese_pricemean = price_stats.loc['japanese', 'mean']
 etsy_japanese_pricemean
 
 
@@ -720,14 +690,7 @@ etsy_japanese_pricemean
 
 
 # create a Bar Chart with each brand as X and price as Y
-etsy_japanese_bar = alt.Chart(etsy_japanese).mark_bar().encode(
-    alt.X('brand'),
-    alt.Y('price', stack=False),
-    alt.Opacity('count()'),
-    tooltip=['price', 'count()']
-    ).configure_mark(
-    color='purple'
-    )
+etsy_japanese_bar = brand_price_chart(etsy_japanese, color='purple')
 
 etsy_japanese_bar
 
@@ -841,7 +804,7 @@ etsy_japanese_brand
 
 
 # Find custom in description
-etsy_custom = etsy[etsy['description'].str.contains('Custom')]
+etsy_custom = etsy[segments['custom']]
 etsy_custom
 
 
@@ -865,7 +828,7 @@ etsy_custom.describe()
 
 
 # etsy_custom_painting
-etsy_custom_painting = etsy_custom[etsy_custom['description'].str.contains('Painting')]
+etsy_custom_painting = etsy[segments['custom_painting']]
 etsy_custom_painting
 
 
@@ -884,7 +847,7 @@ etsy_custom_painting.describe()
 # In[70]:
 
 
-etsy_custom_painting_pricemean = 68.56
+etsy_custom_painting_pricemean = price_stats.loc['custom_painting', 'mean']
 etsy_custom_painting_pricemean
 
 
@@ -896,12 +859,7 @@ etsy_custom_painting_pricemean
 
 
 # create a Bar Chart with each brand as X and price as Y
-etsy_custom_painting_bar = alt.Chart(etsy_custom_painting).mark_bar().encode(
-    alt.X('brand'),
-    alt.Y('price', stack=False),
-    alt.Opacity('count()'),
-    tooltip=['price', 'count()']
-    )
+etsy_custom_painting_bar = brand_price_chart(etsy_custom_painting)
 
 etsy_custom_painting_bar
 
@@ -1022,7 +980,7 @@ etsy_custom_painting_brand
 
 
 # etsy_custom_paper
-etsy_custom_paper = etsy_custom[etsy_custom['description'].str.contains('Paper')]
+etsy_custom_paper = etsy[segments['custom_paper']]
 etsy_custom_paper
 
 
@@ -1041,7 +999,7 @@ etsy_custom_paper.describe()
 # In[78]:
 
 
-etsy_custom_paper_pricemean = 48.40
+etsy_custom_paper_pricemean = price_stats.loc['custom_paper', 'mean']
 etsy_custom_paper_pricemean
 
 
@@ -1053,14 +1011,7 @@ etsy_custom_paper_pricemean
 
 
 # create a Bar Chart with each brand as X and price as Y
-etsy_custom_paper_bar = alt.Chart(etsy_custom_paper).mark_bar().encode(
-    alt.X('brand'),
-    alt.Y('price', stack=False),
-    alt.Opacity('count()'),
-    tooltip=['price', 'count()']
-    ).configure_mark(
-    color='purple'
-    )
+etsy_custom_paper_bar = brand_price_chart(etsy_custom_paper, color='purple')
 
 etsy_custom_paper_bar
 
@@ -1143,7 +1094,7 @@ etsy_custom_paper
 
 
 # search color print in etsy
-etsy_color_print = etsy[etsy['description'].str.contains('color print')]
+etsy_color_print = etsy[segments['color_print']]
 etsy_color_print
 
 
@@ -1162,7 +1113,7 @@ etsy_color_print.describe()
 # In[87]:
 
 
-etsy_color_print_pricemean = 42.57
+etsy_color_print_pricemean = price_stats.loc['color_print', 'mean']
 etsy_color_print_pricemean
 
 
@@ -1174,12 +1125,7 @@ etsy_color_print_pricemean
 
 
 # create a Bar Chart with each brand as X and price as Y
-etsy_color_print_bar = alt.Chart(etsy_color_print).mark_bar().encode(
-    alt.X('brand'),
-    alt.Y('price', stack=False),
-    alt.Opacity('count()'),
-    tooltip=['price', 'count()']
-    )
+etsy_color_print_bar = brand_price_chart(etsy_color_print)
 
 etsy_color_print_bar
 
@@ -1254,14 +1200,14 @@ etsy_color_print_brand
 
 
 # etsy_handmade_paper = find "handmade paper" in "product_details"
-etsy_handmade_paper = etsy[etsy['product_details'].str.contains('handmade paper')]
+etsy_handmade_paper = etsy[segments['handmade_paper']]
 etsy_handmade_paper
 
 
 # In[93]:
 
 
-etsy_handmade_paper_price = 23
+etsy_handmade_paper_price = price_stats.loc['handmade_paper', 'mean']
 etsy_handmade_paper_price
 
 
@@ -1306,6 +1252,15 @@ Total_pricemean = Cobined_pricemean / 10
 Total_pricemean
 
 
+# In[103]:
+
+
+# the same mean straight from the segment statistics, and weighted by the number of listings in each segment
+Total_pricemean = combined_price_mean(price_stats, [segment.name for segment in leaf_segments(AREAS_OF_INTEREST)])
+Total_pricemean_weighted = combined_price_mean(price_stats, [segment.name for segment in leaf_segments(AREAS_OF_INTEREST)], weighted=True)
+Total_pricemean, Total_pricemean_weighted
+
+
 # The **total mean of price overall, combining all of the means of the relevant products and their prices and dividing them, is $57.376**; this serves as a good bench mark of the overall average price for similar products. 
 
 # ## SWOT Analysis
@@ -0,0 +1,85 @@
+"""Time each stage of the segment pipeline on synthetic catalogues.
+
+Usage::
+
+    python benchmarks/bench_pipeline.py --rows 10000 100000 1000000 --json bench.json
+
+Each size is generated once into a temporary directory (or ``--data-dir``)
+and then loaded, cleaned, segmented, described, charted and ranked, with
+the wall time, throughput and peak traced memory of every stage reported.
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from chienchien import SegmentEngine, clean_etsy, load_etsy, segment_charts  # noqa: E402
+from chienchien.instrument import Tracer  # noqa: E402
+from chienchien.synthetic import write_catalogue  # noqa: E402
+
+
+def _charts(engine):
+    charts = segment_charts(engine.etsy, engine.masks())
+    return [chart.to_dict() for chart in charts.values()]
+
+
+def bench(rows, data_dir, trace_memory=True, charts=True):
+    """Run every stage on an ``rows``-listing catalogue; return one record per stage."""
+    path = os.path.join(data_dir, f'etsy_{rows}.json')
+    if not os.path.exists(path):
+        write_catalogue(path, rows)
+    tracer = Tracer(trace_memory=trace_memory)
+    etsy = tracer.call('load', load_etsy, path)
+    etsy = tracer.call('clean', clean_etsy, etsy, rows_in=rows)
+    engine = SegmentEngine(etsy)
+    tracer.call('segment_filter', engine.masks, rows_in=rows)
+    tracer.call('describe', engine.describe, rows_in=rows)
+    if charts:
+        tracer.call('chart_build', _charts, engine, rows_in=rows)
+    tracer.call('ranking', engine.leaderboard, rows_in=rows)
+
+    results = []
+    for record in tracer.records:
+        seconds = record['wall_seconds']
+        peak = record.get('traced_peak_bytes')
+        results.append({
+            'rows': rows,
+            'stage': record['stage'],
+            'seconds': round(seconds, 4),
+            'rows_per_second': round(rows / seconds) if seconds else None,
+            'peak_mib': round(peak / 2**20, 1) if peak is not None else None,
+        })
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, nargs='+', default=[10_000, 100_000])
+    parser.add_argument('--data-dir', help='where to keep generated catalogues (default: a temporary directory)')
+    parser.add_argument('--json', help='also write the results to this JSON file')
+    parser.add_argument('--no-memory', action='store_true', help='skip tracemalloc (faster, no peak memory)')
+    parser.add_argument('--no-charts', action='store_true', help='skip the chart stage (Altair not needed)')
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        data_dir = args.data_dir or tmp
+        os.makedirs(data_dir, exist_ok=True)
+        results = []
+        for rows in args.rows:
+            results += bench(rows, data_dir, not args.no_memory, not args.no_charts)
+
+    print(f"{'rows':>10} {'stage':<15} {'seconds':>9} {'rows/s':>12} {'peak MiB':>9}")
+    for r in results:
+        peak = '' if r['peak_mib'] is None else r['peak_mib']
+        print(f"{r['rows']:>10} {r['stage']:<15} {r['seconds']:>9} {r['rows_per_second'] or '':>12} {peak:>9}")
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
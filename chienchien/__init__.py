@@ -0,0 +1,101 @@
+"""Reusable building blocks for the Chien-Chien Etsy analysis."""
+
+from .analysis import build_charts, open_engine, rank_sellers, run_segments, write_report, write_tables
+from .backends import BACKENDS, run_pipeline
+from .bitmaps import SegmentBitmap, SegmentBitmaps
+from .brands import BrandRollup, BrandSummary, summarize_brands
+from .cache import fingerprint, load_cached
+from .charts import brand_price_chart, brand_price_summary, listing_price_chart, segment_charts
+from .chunked import run_segments_chunked
+from .cleaning import CLEANING_VERSION, add_normalized_columns, clean_etsy, clean_text, normalize_text
+from .dtypes import memory_report, optimize_dtypes
+from .incremental import IncrementalCatalogue, ScrapeDelta, diff_scrape, listing_keys
+from .index import InvertedIndex, load_index
+from .instrument import NullTracer, Tracer
+from .loader import ANALYSIS_COLUMNS, iter_chunks, iter_records, load_etsy
+from .matcher import KeywordMatcher, match_keywords
+from .memo import MemoizedEngine, ResultCache, frame_fingerprint
+from .ranking import top_k, top_k_segments
+from .scoring import add_rating_scores, bayesian_rating, brand_scores, rating_scores, wilson_lower_bound
+from .segments import (
+    AREAS_OF_INTEREST,
+    Segment,
+    SegmentEngine,
+    SegmentResult,
+    SegmentTables,
+    dump_segments,
+    leaf_segments,
+    load_segments,
+    segment_masks,
+)
+from .snapshots import SnapshotStore
+from .stats import combined_price_mean, describe_segments, segment_price_stats
+from .views import SegmentView
+
+__all__ = [
+    'ANALYSIS_COLUMNS',
+    'AREAS_OF_INTEREST',
+    'BACKENDS',
+    'BrandRollup',
+    'BrandSummary',
+    'CLEANING_VERSION',
+    'IncrementalCatalogue',
+    'InvertedIndex',
+    'KeywordMatcher',
+    'MemoizedEngine',
+    'NullTracer',
+    'ResultCache',
+    'ScrapeDelta',
+    'Segment',
+    'SegmentBitmap',
+    'SegmentBitmaps',
+    'SegmentEngine',
+    'SegmentResult',
+    'SegmentTables',
+    'SegmentView',
+    'SnapshotStore',
+    'Tracer',
+    'add_normalized_columns',
+    'add_rating_scores',
+    'bayesian_rating',
+    'brand_price_chart',
+    'brand_price_summary',
+    'brand_scores',
+    'build_charts',
+    'clean_etsy',
+    'clean_text',
+    'combined_price_mean',
+    'describe_segments',
+    'diff_scrape',
+    'dump_segments',
+    'fingerprint',
+    'frame_fingerprint',
+    'iter_chunks',
+    'iter_records',
+    'leaf_segments',
+    'listing_keys',
+    'listing_price_chart',
+    'load_cached',
+    'load_etsy',
+    'load_index',
+    'load_segments',
+    'match_keywords',
+    'memory_report',
+    'normalize_text',
+    'open_engine',
+    'optimize_dtypes',
+    'rank_sellers',
+    'rating_scores',
+    'run_pipeline',
+    'run_segments',
+    'run_segments_chunked',
+    'segment_charts',
+    'segment_masks',
+    'segment_price_stats',
+    'summarize_brands',
+    'top_k',
+    'top_k_segments',
+    'wilson_lower_bound',
+    'write_report',
+    'write_tables',
+]
@@ -0,0 +1,98 @@
+"""High-level entry points for running the Chien-Chien analysis headless."""
+
+import json
+import os
+from urllib.parse import quote
+
+from .brands import SHOP_URL
+from .cache import DEFAULT_CACHE_DIR, load_cached
+from .charts import segment_charts
+from .instrument import NullTracer
+from .scoring import SCORE_COLUMNS, brand_scores
+from .segments import AREAS_OF_INTEREST, SegmentEngine
+from .views import SegmentView
+
+
+def open_engine(path='etsy.json', segments=AREAS_OF_INTEREST, cache_dir=DEFAULT_CACHE_DIR, normalized=True):
+    """Return a ``SegmentEngine`` over the cached, cleaned data set at ``path``.
+
+    Keywords match regardless of case, accents and whitespace unless
+    ``normalized`` is false.
+    """
+    return SegmentEngine(load_cached(path, cache_dir, normalized=normalized), segments, normalized)
+
+
+def run_segments(engine, k=10, min_reviews=0, tracer=None, by=None):
+    """Return the ``SegmentTables`` (stats, uniques, leaderboards) of ``engine``."""
+    return engine.tables(k=k, by=by, min_reviews=min_reviews, tracer=tracer)
+
+
+def build_charts(engine, **kwargs):
+    """Return ``{segment: chart}`` brand/price charts; imports Altair on first use."""
+    return segment_charts(engine.etsy, engine.masks(), **kwargs)
+
+
+def rank_sellers(engine, segment=None, method='bayesian'):
+    """Rank brands by confidence-adjusted rating, overall or within ``segment``."""
+    etsy = engine.etsy
+    if segment is not None:
+        etsy = SegmentView.from_mask(etsy, engine.masks()[segment], segment).frame(SCORE_COLUMNS)
+    return brand_scores(etsy, method)
+
+
+def write_tables(tables, out_dir, tracer=None):
+    """Write the ``SegmentTables`` ``tables`` to ``out_dir``; return the paths written.
+
+    Writes ``describe.csv`` and ``price_stats.csv`` (per-segment statistics),
+    ``leaderboard.csv`` (top listings per segment), ``brands.json`` and
+    ``categories.json`` (each segment's brands with their shop links, and
+    its categories).
+    """
+    tracer = tracer or NullTracer()
+    os.makedirs(out_dir, exist_ok=True)
+    written = []
+
+    def path(name):
+        written.append(os.path.join(out_dir, name))
+        return written[-1]
+
+    with tracer.stage('write_tables'):
+        tables.describe.to_csv(path('describe.csv'))
+        tables.price_stats().to_csv(path('price_stats.csv'))
+        tables.leaderboard.to_csv(path('leaderboard.csv'))
+        with open(path('brands.json'), 'w', encoding='utf-8') as f:
+            brands = {
+                name: [{'brand': str(brand), 'url': SHOP_URL.format(quote(str(brand)))} for brand in values]
+                for name, values in tables.brand.items()
+            }
+            json.dump(brands, f, indent=2, ensure_ascii=False)
+        with open(path('categories.json'), 'w', encoding='utf-8') as f:
+            categories = {name: [str(value) for value in values] for name, values in tables.category.items()}
+            json.dump(categories, f, indent=2, ensure_ascii=False)
+    return written
+
+
+def write_report(engine, out_dir, k=10, min_reviews=0, charts=True, chart_format='html', tracer=None, by=None):
+    """Run every segment of ``engine`` and write the results to ``out_dir``.
+
+    Writes the tables of ``write_tables`` (with top-``k`` leaderboards
+    ranked by ``by``, see ``top_k``), ``sellers.csv`` (brands by adjusted
+    rating) and, with ``charts``, one ``charts/<segment>.<chart_format>``
+    per segment. All steps share the engine's masks. Returns the paths
+    written.
+    """
+    tracer = tracer or NullTracer()
+    written = write_tables(run_segments(engine, k, min_reviews, tracer, by), out_dir, tracer)
+
+    def path(name):
+        written.append(os.path.join(out_dir, name))
+        return written[-1]
+
+    tracer.call('rank_sellers', rank_sellers, engine).to_csv(path('sellers.csv'))
+
+    if charts:
+        os.makedirs(os.path.join(out_dir, 'charts'), exist_ok=True)
+        with tracer.stage('chart_build', len(engine.etsy)):
+            for name, chart in build_charts(engine).items():
+                chart.save(path(os.path.join('charts', f'{name}.{chart_format}')))
+    return written
@@ -0,0 +1,169 @@
+"""Interchangeable execution backends for the whole segment pipeline."""
+
+import numpy as np
+import pandas as pd
+
+from .chunked import run_segments_chunked
+from .cleaning import MATCH_NORMALIZERS, NORMALIZED_SUFFIX, SEPARATOR, _clean_arrow, clean_etsy, normalize_text
+from .instrument import NullTracer
+from .loader import ANALYSIS_COLUMNS, _first_char, load_etsy
+from .ranking import LEADERBOARD_COLUMNS
+from .scoring import add_rating_scores, rating_scores
+from .segments import AREAS_OF_INTEREST, SegmentEngine, SegmentTables
+from .stats import DESCRIBE_COLUMNS, DESCRIBE_STATS
+
+BACKENDS = ('pandas', 'chunked', 'polars')
+
+
+def _run_pandas(path, segments, k, by, tie_breaker, min_reviews, normalized, tracer):
+    etsy = tracer.call('load', load_etsy, path)
+    etsy = tracer.call('clean', clean_etsy, etsy, normalized=normalized, rows_in=len(etsy))
+    if by == 'rating_score':
+        etsy = tracer.call('score', add_rating_scores, etsy, rows_in=len(etsy))
+    return SegmentEngine(etsy, segments, normalized).tables(k, by, tie_breaker, min_reviews, tracer)
+
+
+def _read_polars(path, columns):
+    import polars as pl
+
+    with open(path, encoding='utf-8') as f:
+        is_array = _first_char(f) == '['
+    if is_array:
+        return pl.read_json(path).select(columns)
+    return pl.scan_ndjson(path).select(columns).collect()
+
+
+def _run_polars(path, segments, k, by, tie_breaker, min_reviews, normalized, tracer):
+    import polars as pl
+
+    etsy = tracer.call('load', _read_polars, path, list(ANALYSIS_COLUMNS))
+    rows = len(etsy)
+    with tracer.stage('clean', rows):
+        etsy = etsy.with_columns(
+            pl.col('product_details').str.replace_all(SEPARATOR, ', ', literal=True),
+            pl.int_range(pl.len(), dtype=pl.Int64).alias('row'),
+        )
+        if normalized:
+            # the shadow columns go through the same Arrow kernels as clean_etsy's
+            etsy = etsy.with_columns(
+                pl.col(column).map_batches(
+                    lambda texts: pl.from_arrow(_clean_arrow(texts.to_arrow(), MATCH_NORMALIZERS)),
+                    return_dtype=pl.String,
+                ).alias(column + NORMALIZED_SUFFIX)
+                for column in dict.fromkeys(segment.column for segment in segments)
+            )
+
+    if by == 'rating_score':
+        with tracer.stage('score', rows):
+            score = rating_scores(etsy['average_rating'].to_numpy(), etsy['reviews_count'].to_numpy())
+            # NaN is not null to polars, and unrated rows must drop out of the ranking
+            etsy = etsy.with_columns(pl.Series('rating_score', score).fill_nan(None))
+
+    # every (column, keyword) scan and segment AND runs in one multi-threaded select
+    hits = {}
+    for segment in segments:
+        for keyword in (segment.keyword, segment.sub_keyword):
+            if keyword is not None and (segment.column, keyword) not in hits:
+                if normalized:
+                    texts, keyword_text = pl.col(segment.column + NORMALIZED_SUFFIX), normalize_text(keyword)
+                else:
+                    texts, keyword_text = pl.col(segment.column), keyword
+                hits[(segment.column, keyword)] = texts.str.contains(keyword_text, literal=True).fill_null(False)
+    masks = {}
+    for segment in segments:
+        mask = hits[segment.parent]
+        if segment.sub_keyword is not None:
+            mask = mask & hits[(segment.column, segment.sub_keyword)]
+        masks[segment.name] = mask
+    with tracer.stage('segment_filter', rows):
+        etsy = etsy.with_columns(**{f'__{name}': mask for name, mask in masks.items()})
+
+    stat_exprs = []
+    for name in masks:
+        member = pl.col(f'__{name}')
+        for column in DESCRIBE_COLUMNS:
+            values = pl.col(column).cast(pl.Float64).filter(member).drop_nans()
+            stat_exprs += [
+                values.count().cast(pl.Float64).alias(f'{name}|{column}|count'),
+                values.mean().alias(f'{name}|{column}|mean'),
+                values.std().alias(f'{name}|{column}|std'),
+                values.min().alias(f'{name}|{column}|min'),
+                values.quantile(0.25, 'linear').alias(f'{name}|{column}|25%'),
+                values.quantile(0.5, 'linear').alias(f'{name}|{column}|50%'),
+                values.quantile(0.75, 'linear').alias(f'{name}|{column}|75%'),
+                values.max().alias(f'{name}|{column}|max'),
+            ]
+    with tracer.stage('describe', rows):
+        stats = etsy.select(stat_exprs).row(0, named=True)
+    index = pd.MultiIndex.from_product([list(masks), list(DESCRIBE_COLUMNS)], names=['segment', 'column'])
+    describe = pd.DataFrame(
+        [[stats[f'{name}|{column}|{stat}'] for stat in DESCRIBE_STATS] for name, column in index],
+        index=index, columns=DESCRIBE_STATS, dtype=np.float64,
+    )
+
+    with tracer.stage('uniques', rows):
+        uniques = etsy.select(
+            [pl.col('category').filter(pl.col(f'__{name}')).unique(maintain_order=True).implode().alias(f'c|{name}')
+             for name in masks]
+            + [pl.col('brand').filter(pl.col(f'__{name}')).unique(maintain_order=True).implode().alias(f'b|{name}')
+               for name in masks]
+        ).row(0, named=True)
+
+    keys = [by] if tie_breaker is None else [by, tie_breaker]
+    board_columns = list(dict.fromkeys(LEADERBOARD_COLUMNS + tuple(keys)))
+    boards = []
+    with tracer.stage('ranking', rows):
+        for name in masks:
+            member = pl.col(f'__{name}')
+            if min_reviews:
+                member = member & (pl.col('reviews_count') >= min_reviews)
+            board = (
+                etsy.filter(member & pl.all_horizontal(pl.col(keys).is_not_null()))
+                .sort(keys, descending=True, nulls_last=True, maintain_order=True)
+                .head(k)
+                .select(['row', *board_columns])
+                .to_pandas()
+                .set_index('row')
+                .rename_axis(None)
+            )
+            board.insert(0, 'rank', range(1, len(board) + 1))
+            board.insert(0, 'segment', name)
+            boards.append(board)
+
+    return SegmentTables(
+        describe=describe,
+        category={name: uniques[f'c|{name}'] for name in masks},
+        brand={name: uniques[f'b|{name}'] for name in masks},
+        leaderboard=pd.concat(boards) if boards else pd.DataFrame(columns=['segment', 'rank', *board_columns]),
+    )
+
+
+def _run_chunked(path, segments, k, by, tie_breaker, min_reviews, normalized, tracer):
+    if by == 'rating_score':
+        raise ValueError('the chunked backend cannot rank by rating_score: its prior needs the whole catalogue')
+    # loading, cleaning and matching are interleaved chunk by chunk
+    return tracer.call('pipeline', run_segments_chunked, path, segments, k=k, by=by, tie_breaker=tie_breaker,
+                       min_reviews=min_reviews, normalized=normalized)
+
+
+_RUNNERS = {'pandas': _run_pandas, 'chunked': _run_chunked, 'polars': _run_polars}
+
+
+def run_pipeline(path='etsy.json', segments=AREAS_OF_INTEREST, backend='pandas', k=10, by=None,
+                 tie_breaker='reviews_count', min_reviews=0, normalized=False, tracer=None):
+    """Load, clean and analyse ``path`` with the chosen ``backend``.
+
+    ``'pandas'`` runs ``SegmentEngine`` in memory, ``'chunked'`` streams the
+    file (``run_segments_chunked``) and ``'polars'`` runs every step on
+    Arrow-backed Polars columns with its multi-threaded query engine. All
+    return the same ``SegmentTables``, so they can be benchmarked and
+    swapped freely; leaderboards rank by ``average_rating`` unless ``by``
+    says otherwise. ``by='rating_score'`` ranks like an engine over
+    ``load_cached`` (``add_rating_scores``), except on ``'chunked'``,
+    which never holds the whole catalogue the score's prior needs. Pass an ``instrument.Tracer`` as ``tracer`` to record
+    every stage.
+    """
+    if backend not in _RUNNERS:
+        raise ValueError(f'unknown backend {backend!r}, expected one of {BACKENDS}')
+    return _RUNNERS[backend](path, tuple(segments), k, by or 'average_rating', tie_breaker, min_reviews,
+                             normalized, tracer or NullTracer())
@@ -0,0 +1,171 @@
+"""Compressed row-id bitmaps of segment membership and their set algebra."""
+
+import array
+import importlib.util
+
+import numpy as np
+import pandas as pd
+
+# Roaring bitmaps when pyroaring is installed, packed bit arrays otherwise
+BACKEND = 'roaring' if importlib.util.find_spec('pyroaring') is not None else 'numpy'
+# rows unpacked at a time when counting overlaps of packed bitmaps
+OVERLAP_BLOCK_ROWS = 1 << 13
+
+
+def _to_roaring(rows):
+    from pyroaring import BitMap
+
+    values = array.array('I')
+    values.frombytes(np.asarray(rows, dtype=np.uint32).tobytes())
+    return BitMap(values)
+
+
+class SegmentBitmap:
+    """The member rows of one segment of an ``n_rows`` frame, as a bitmap.
+
+    ``&``, ``|`` and ``-`` (and-not) combine bitmaps of the same frame,
+    ``len()`` is the cardinality and rows are only materialized by
+    ``rows()``, ``to_mask()`` or ``take()``. Backed by a pyroaring
+    ``BitMap`` or by a ``numpy.packbits`` array (see ``BACKEND``).
+    """
+
+    __slots__ = ('bits', 'n_rows')
+
+    def __init__(self, bits, n_rows):
+        self.bits = bits
+        self.n_rows = n_rows
+
+    @classmethod
+    def from_mask(cls, mask, backend=None):
+        """Build the bitmap of a boolean row mask."""
+        mask = np.asarray(mask, dtype=bool)
+        if (backend or BACKEND) == 'roaring':
+            return cls(_to_roaring(np.flatnonzero(mask)), len(mask))
+        return cls(np.packbits(mask), len(mask))
+
+    @classmethod
+    def from_rows(cls, rows, n_rows, backend=None):
+        """Build the bitmap of the row positions ``rows``."""
+        if (backend or BACKEND) == 'roaring':
+            return cls(_to_roaring(rows), n_rows)
+        mask = np.zeros(n_rows, dtype=bool)
+        mask[rows] = True
+        return cls(np.packbits(mask), n_rows)
+
+    @property
+    def packed(self):
+        return isinstance(self.bits, np.ndarray)
+
+    def _combine(self, other, op):
+        if self.n_rows != other.n_rows or self.packed != other.packed:
+            raise ValueError('bitmaps cover different frames or backends')
+        return type(self)(op(self.bits, other.bits), self.n_rows)
+
+    def __and__(self, other):
+        return self._combine(other, lambda a, b: a & b)
+
+    def __or__(self, other):
+        return self._combine(other, lambda a, b: a | b)
+
+    def __sub__(self, other):
+        return self._combine(other, lambda a, b: a & ~b if isinstance(a, np.ndarray) else a - b)
+
+    andnot = __sub__
+
+    def __len__(self):
+        if self.packed:
+            return int(np.bitwise_count(self.bits).sum(dtype=np.int64))
+        return len(self.bits)
+
+    def intersection_size(self, other):
+        """Return ``len(self & other)`` without building the intersection where possible."""
+        if not self.packed and not other.packed:
+            return self.bits.intersection_cardinality(other.bits)
+        return len(self & other)
+
+    def jaccard(self, other):
+        """Return ``|self & other| / |self | other|`` (0 for two empty bitmaps)."""
+        both = self.intersection_size(other)
+        either = len(self) + len(other) - both
+        return both / either if either else 0.0
+
+    def rows(self):
+        """Return the sorted member row positions."""
+        if self.packed:
+            return np.flatnonzero(np.unpackbits(self.bits, count=self.n_rows))
+        return np.frombuffer(self.bits.to_array(), dtype=np.uint32).astype(np.int64)
+
+    def to_mask(self):
+        """Return the boolean row mask."""
+        if self.packed:
+            return np.unpackbits(self.bits, count=self.n_rows).astype(bool)
+        mask = np.zeros(self.n_rows, dtype=bool)
+        mask[self.rows()] = True
+        return mask
+
+    def take(self, frame, columns=None):
+        """Materialize the member rows of ``frame`` (optionally only ``columns``)."""
+        rows = self.rows()
+        return frame.iloc[rows] if columns is None else frame.iloc[rows, frame.columns.get_indexer(columns)]
+
+    @property
+    def nbytes(self):
+        """Size of the bitmap itself, in bytes."""
+        return self.bits.nbytes if self.packed else len(self.bits.serialize())
+
+
+class SegmentBitmaps:
+    """``{segment: SegmentBitmap}`` over one frame, with cross-segment overlaps."""
+
+    def __init__(self, bitmaps):
+        self.bitmaps = dict(bitmaps)
+
+    @classmethod
+    def from_masks(cls, masks, backend=None):
+        """Build the bitmaps of every column of a rows x segments mask matrix."""
+        return cls({name: SegmentBitmap.from_mask(masks[name].to_numpy(), backend) for name in masks.columns})
+
+    def __getitem__(self, name):
+        return self.bitmaps[name]
+
+    def __iter__(self):
+        return iter(self.bitmaps)
+
+    def __len__(self):
+        return len(self.bitmaps)
+
+    def cardinalities(self):
+        """Return the member count of every segment."""
+        return pd.Series({name: len(bitmap) for name, bitmap in self.bitmaps.items()}, dtype=np.int64)
+
+    def overlap_matrix(self):
+        """Return the segments x segments table of shared member counts.
+
+        The diagonal holds each segment's cardinality. Packed bitmaps are
+        counted a block of rows at a time with one matrix product per
+        block, so thousands of segments cost one pass over their bits.
+        """
+        names = list(self.bitmaps)
+        bitmaps = list(self.bitmaps.values())
+        counts = np.zeros((len(names), len(names)), dtype=np.int64)
+        if bitmaps and all(bitmap.packed for bitmap in bitmaps):
+            packed = np.stack([bitmap.bits for bitmap in bitmaps])
+            step = OVERLAP_BLOCK_ROWS // 8
+            for start in range(0, packed.shape[1], step):
+                block = np.unpackbits(packed[:, start:start + step], axis=1).astype(np.float32)
+                # per-block counts stay far below float32's exact integer range
+                counts += (block @ block.T).astype(np.int64)
+        else:
+            for i, a in enumerate(bitmaps):
+                for j in range(i, len(bitmaps)):
+                    counts[i, j] = counts[j, i] = a.intersection_size(bitmaps[j])
+        return pd.DataFrame(counts, index=names, columns=names)
+
+    def jaccard_matrix(self):
+        """Return the segments x segments Jaccard similarity table."""
+        both = self.overlap_matrix()
+        sizes = np.diag(both.to_numpy())
+        either = sizes[:, None] + sizes[None, :] - both.to_numpy()
+        with np.errstate(invalid='ignore', divide='ignore'):
+            jaccard = np.where(either > 0, both.to_numpy() / either, 0.0)
+        return pd.DataFrame(jaccard, index=both.index, columns=both.columns)
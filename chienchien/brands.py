@@ -0,0 +1,206 @@
+"""Per-brand rollup of listings, prices, reviews and segment memberships."""
+
+import json
+import math
+from dataclasses import asdict, dataclass, field
+from urllib.parse import quote
+
+import numpy as np
+import pandas as pd
+
+SHOP_URL = 'https://www.etsy.com/shop/{}'
+
+
+@dataclass
+class BrandSummary:
+    """Mergeable aggregates of one brand's listings."""
+
+    brand: str
+    listings: int = 0
+    price_sum: float = 0.0
+    price_count: int = 0
+    price_min: float = math.inf
+    price_max: float = -math.inf
+    reviews_count: int = 0
+    rating_weighted: float = 0.0
+    categories: set = field(default_factory=set)
+    segments: set = field(default_factory=set)
+
+    @property
+    def price_mean(self):
+        return self.price_sum / self.price_count if self.price_count else math.nan
+
+    @property
+    def average_rating(self):
+        """Review-weighted mean rating of the brand's listings."""
+        return self.rating_weighted / self.reviews_count if self.reviews_count else math.nan
+
+    @property
+    def url(self):
+        return SHOP_URL.format(quote(self.brand))
+
+    def merge(self, other):
+        """Fold the aggregates of ``other`` (the same brand) into this one."""
+        self.listings += other.listings
+        self.price_sum += other.price_sum
+        self.price_count += other.price_count
+        self.price_min = min(self.price_min, other.price_min)
+        self.price_max = max(self.price_max, other.price_max)
+        self.reviews_count += other.reviews_count
+        self.rating_weighted += other.rating_weighted
+        self.categories |= other.categories
+        self.segments |= other.segments
+
+
+def summarize_brands(etsy, masks=None):
+    """Return ``{brand: BrandSummary}`` for ``etsy`` in one groupby pass.
+
+    ``masks`` is the optional rows x segments membership matrix; a brand is
+    a member of every segment one of its listings is in.
+    """
+    rating = etsy['average_rating'].to_numpy(dtype=np.float64)
+    reviews = etsy['reviews_count'].to_numpy(dtype=np.float64)
+    rated = ~(np.isnan(rating) | np.isnan(reviews))
+    brand = etsy['brand'].to_numpy()
+    grouped = pd.DataFrame({
+        'brand': brand,
+        'price': etsy['price'].to_numpy(dtype=np.float64),
+        'reviews': np.where(rated, reviews, 0.0),
+        'weighted': np.where(rated, rating * reviews, 0.0),
+        'category': etsy['category'].to_numpy(),
+    }).groupby('brand', sort=False)
+    totals = grouped.agg(
+        listings=('price', 'size'),
+        price_sum=('price', 'sum'),
+        price_count=('price', 'count'),
+        price_min=('price', 'min'),
+        price_max=('price', 'max'),
+        reviews_count=('reviews', 'sum'),
+        rating_weighted=('weighted', 'sum'),
+    )
+    categories = grouped['category'].agg(lambda c: set(c.dropna()))
+    if masks is not None and len(masks.columns):
+        member = pd.DataFrame(masks.to_numpy(), columns=masks.columns).groupby(brand, sort=False).any()
+        segments = {b: set(member.columns[row]) for b, row in zip(member.index, member.to_numpy())}
+    else:
+        segments = {}
+
+    summaries = {}
+    for row in totals.itertuples():
+        summaries[row.Index] = BrandSummary(
+            brand=row.Index,
+            listings=int(row.listings),
+            price_sum=float(row.price_sum),
+            price_count=int(row.price_count),
+            price_min=float(row.price_min) if row.price_count else math.inf,
+            price_max=float(row.price_max) if row.price_count else -math.inf,
+            reviews_count=int(row.reviews_count),
+            rating_weighted=float(row.rating_weighted),
+            categories=categories[row.Index],
+            segments=segments.get(row.Index, set()),
+        )
+    return summaries
+
+
+class BrandRollup:
+    """Persistent per-brand aggregates with O(1) lookups by brand name.
+
+    Built once with ``build`` and kept current with ``update`` as new
+    scrape rows arrive, without rescanning the rows already folded in.
+    """
+
+    def __init__(self, summaries=None):
+        self.summaries = dict(summaries or {})
+
+    @classmethod
+    def build(cls, etsy, masks=None):
+        return cls(summarize_brands(etsy, masks))
+
+    def update(self, new_rows, masks=None):
+        """Fold newly scraped rows (and their segment masks) into the rollup."""
+        for brand, summary in summarize_brands(new_rows, masks).items():
+            if brand in self.summaries:
+                self.summaries[brand].merge(summary)
+            else:
+                self.summaries[brand] = summary
+
+    def recompute(self, etsy, brands, masks=None):
+        """Re-aggregate ``brands`` from their rows in ``etsy``.
+
+        Use after listings were removed or changed in place, which ``update``
+        cannot undo; only the rows of ``brands`` are summarized and brands
+        left without listings are dropped.
+        """
+        brands = set(brands)
+        for brand in brands:
+            self.summaries.pop(brand, None)
+        rows = etsy['brand'].isin(brands).to_numpy()
+        self.summaries.update(summarize_brands(etsy[rows], None if masks is None else masks[rows]))
+
+    def __getitem__(self, brand):
+        return self.summaries[brand]
+
+    def __contains__(self, brand):
+        return brand in self.summaries
+
+    def __len__(self):
+        return len(self.summaries)
+
+    def get(self, brand, default=None):
+        return self.summaries.get(brand, default)
+
+    def in_segment(self, segment):
+        """Return the names of the brands with a listing in ``segment``."""
+        return [brand for brand, summary in self.summaries.items() if segment in summary.segments]
+
+    def to_frame(self):
+        """Return the rollup as a DataFrame indexed by brand."""
+        rows = [
+            {
+                'brand': s.brand,
+                'listings': s.listings,
+                'price_mean': s.price_mean,
+                'price_min': s.price_min if s.price_count else math.nan,
+                'price_max': s.price_max if s.price_count else math.nan,
+                'reviews_count': s.reviews_count,
+                'average_rating': s.average_rating,
+                'categories': sorted(s.categories),
+                'segments': sorted(s.segments),
+                'url': s.url,
+            }
+            for s in self.summaries.values()
+        ]
+        return pd.DataFrame(rows, columns=[
+            'brand', 'listings', 'price_mean', 'price_min', 'price_max', 'reviews_count',
+            'average_rating', 'categories', 'segments', 'url',
+        ]).set_index('brand')
+
+    def save(self, path):
+        """Write the rollup to a JSON file."""
+        records = []
+        for summary in self.summaries.values():
+            record = asdict(summary)
+            record['categories'] = sorted(summary.categories)
+            record['segments'] = sorted(summary.segments)
+            for key in ('price_min', 'price_max'):
+                if math.isinf(record[key]):
+                    record[key] = None
+            records.append(record)
+        with open(path, 'w') as f:
+            json.dump(records, f)
+
+    @classmethod
+    def load(cls, path):
+        """Read a rollup written by ``save``."""
+        with open(path) as f:
+            records = json.load(f)
+        summaries = {}
+        for record in records:
+            record['categories'] = set(record['categories'])
+            record['segments'] = set(record['segments'])
+            if record['price_min'] is None:
+                record['price_min'] = math.inf
+            if record['price_max'] is None:
+                record['price_max'] = -math.inf
+            summaries[record['brand']] = BrandSummary(**record)
+        return cls(summaries)
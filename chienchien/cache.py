@@ -0,0 +1,120 @@
+"""Columnar on-disk cache of the cleaned Etsy frame."""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+
+from .cleaning import CLEANING_VERSION, clean_etsy
+from .dtypes import optimize_dtypes
+from .loader import ANALYSIS_COLUMNS, load_etsy
+from .scoring import add_rating_scores
+
+DEFAULT_CACHE_DIR = '.etsy_cache'
+
+
+def file_sha256(path, block_size=1 << 20):
+    """Return the hex SHA-256 of the file at ``path``."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def fingerprint(path, known=None):
+    """Return the size, mtime and content hash of the file at ``path``.
+
+    When ``known`` (a previous fingerprint) has the same size and mtime, its
+    hash is reused instead of re-reading the whole file.
+    """
+    stat = os.stat(path)
+    fp = {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+    if known and all(known.get(k) == fp[k] for k in ('size', 'mtime_ns')):
+        fp['sha256'] = known['sha256']
+    else:
+        fp['sha256'] = file_sha256(path)
+    return fp
+
+
+def _cache_paths(path, cache_dir):
+    path = Path(path)
+    # the resolved path keeps same-named sources in different directories apart
+    key = f"{path.stem}-{hashlib.sha256(str(path.resolve()).encode()).hexdigest()[:16]}"
+    cache_dir = Path(cache_dir)
+    return cache_dir / f'{key}.parquet', cache_dir / f'{key}.meta.json'
+
+
+def _read_meta(meta_path):
+    try:
+        with open(meta_path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _is_fresh(meta, meta_path, path, columns, normalized=False):
+    """Check ``meta`` against the source file, hashing only when needed."""
+    if not meta or meta.get('cleaning_version') != CLEANING_VERSION:
+        return False
+    if meta.get('columns') != list(columns):
+        return False
+    if normalized and not meta.get('normalized'):
+        return False
+    stat = os.stat(path)
+    if stat.st_size != meta['source']['size']:
+        return False
+    if stat.st_mtime_ns == meta['source']['mtime_ns']:
+        return True
+    # touched but possibly unchanged: fall back to the content hash and
+    # remember the new mtime so the next run skips hashing again
+    if file_sha256(path) != meta['source']['sha256']:
+        return False
+    meta['source']['mtime_ns'] = stat.st_mtime_ns
+    _write_meta(meta_path, meta)
+    return True
+
+
+def _write_atomic(path, write):
+    tmp = path.with_name(path.name + '.tmp')
+    write(tmp)
+    os.replace(tmp, path)
+
+
+def _write_meta(meta_path, meta):
+    _write_atomic(meta_path, lambda tmp: tmp.write_text(json.dumps(meta, indent=2)))
+
+
+def load_cached(path='etsy.json', cache_dir=DEFAULT_CACHE_DIR, columns=ANALYSIS_COLUMNS, refresh=False,
+                workers=1, normalized=False):
+    """Load the cleaned Etsy frame, reusing the columnar cache when valid.
+
+    The cache is keyed by the source file's size, mtime and SHA-256 plus
+    ``CLEANING_VERSION``; on a hit the Parquet file is read memory-mapped
+    instead of re-parsing and re-cleaning the JSON. The cached frame has
+    the compact dtypes from ``optimize_dtypes`` and the per-listing
+    ``rating_score`` from ``add_rating_scores``. With ``normalized`` the
+    cache also holds the normalized shadow columns for case-insensitive
+    matching (a cache built with them serves both kinds of request). On a
+    miss ``workers`` is passed on to ``clean_text``.
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    data_path, meta_path = _cache_paths(path, cache_dir)
+    meta = _read_meta(meta_path)
+    if not refresh and data_path.exists() and _is_fresh(meta, meta_path, path, columns, normalized):
+        return pq.read_table(data_path, memory_map=True).to_pandas()
+
+    etsy = optimize_dtypes(add_rating_scores(clean_etsy(load_etsy(path, columns), workers, normalized=normalized)))
+    data_path.parent.mkdir(parents=True, exist_ok=True)
+    table = pa.Table.from_pandas(etsy, preserve_index=False)
+    _write_atomic(data_path, lambda tmp: pq.write_table(table, tmp))
+    meta = {
+        'source': fingerprint(path),
+        'cleaning_version': CLEANING_VERSION,
+        'columns': list(columns),
+        'normalized': normalized,
+    }
+    _write_meta(meta_path, meta)
+    return etsy
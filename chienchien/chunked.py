@@ -0,0 +1,80 @@
+"""Out-of-core segment analysis that streams the scrape in chunks."""
+
+import pandas as pd
+
+from .cleaning import clean_etsy
+from .loader import ANALYSIS_COLUMNS, iter_chunks
+from .ranking import LEADERBOARD_COLUMNS, top_k_segments
+from .segments import AREAS_OF_INTEREST, SegmentEngine, SegmentTables
+from .stats import DESCRIBE_COLUMNS, describe_segments
+from .views import SegmentView
+
+
+def run_segments_chunked(path, segments=AREAS_OF_INTEREST, chunksize=100_000, k=10,
+                         by=None, tie_breaker='reviews_count', min_reviews=0,
+                         normalized=False):
+    """Run the segment analysis over ``path`` without loading it whole.
+
+    Each chunk is cleaned and matched on its own; only what the results
+    need survives it: the numeric ``describe()`` columns of segment
+    members, the first-seen categories and brands of each segment and each
+    segment's top-``k`` candidates. The final statistics, uniques and
+    leaderboards are the same as ``SegmentEngine`` gives on the whole frame,
+    while memory is bounded by the segment members' numeric values rather
+    than the text of the whole catalogue.
+
+    ``by`` defaults to ``average_rating``: the streamed columns carry no
+    ``rating_score`` (its prior needs the whole catalogue), so this is the
+    default ``top_k`` picks for a ``SegmentEngine`` over ``clean_etsy``
+    output; an engine over ``load_cached`` ranks by ``rating_score``.
+    """
+    segments = tuple(segments)
+    by = by or 'average_rating'
+    names = [segment.name for segment in segments]
+    keys = [by] if tie_breaker is None else [by, tie_breaker]
+    numeric_parts, member_parts = [], []
+    candidate_parts, candidate_masks = [], []
+    categories = {name: {} for name in names}
+    brands = {name: {} for name in names}
+
+    for chunk in iter_chunks(path, ANALYSIS_COLUMNS, chunksize):
+        chunk = clean_etsy(chunk, normalized=normalized)
+        masks = SegmentEngine(chunk, segments, normalized).masks()
+        in_any = masks.any(axis=1).to_numpy()
+        if not in_any.any():
+            continue
+        numeric_parts.append(chunk.loc[in_any, list(DESCRIBE_COLUMNS)])
+        member_parts.append(masks[in_any])
+
+        winners = set()
+        for name in names:
+            member = SegmentView.from_mask(chunk, masks[name])
+            categories[name].update(dict.fromkeys(member.column('category').unique().tolist()))
+            brands[name].update(dict.fromkeys(member.column('brand').unique().tolist()))
+            if min_reviews:
+                member = member.narrow(member.column('reviews_count').to_numpy() >= min_reviews)
+            winners.update(member.frame(keys).dropna().nlargest(k, keys, keep='first').index[:k])
+        winners = sorted(winners)
+        candidate_parts.append(chunk.loc[winners, list(dict.fromkeys(LEADERBOARD_COLUMNS + tuple(keys)))])
+        candidate_masks.append(masks.loc[winners])
+
+    if numeric_parts:
+        numeric = pd.concat(numeric_parts)
+        members = pd.concat(member_parts)
+        candidates = pd.concat(candidate_parts)
+        candidate_members = pd.concat(candidate_masks)
+    else:
+        numeric = pd.DataFrame(columns=list(DESCRIBE_COLUMNS), dtype=float)
+        members = pd.DataFrame(columns=names, dtype=bool)
+        candidates = pd.DataFrame(columns=list(LEADERBOARD_COLUMNS))
+        candidate_members = members
+
+    # candidates keep their original row order, so nlargest breaks ties as
+    # it would on the whole frame
+    leaderboard = top_k_segments(candidates, candidate_members, k, by, tie_breaker, min_reviews)
+    return SegmentTables(
+        describe=describe_segments(numeric, members),
+        category={name: list(values) for name, values in categories.items()},
+        brand={name: list(values) for name, values in brands.items()},
+        leaderboard=leaderboard,
+    )
@@ -0,0 +1,175 @@
+"""Cleaning steps applied to the loaded Etsy frame."""
+
+import os
+import re
+import unicodedata
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+# bump whenever a cleaning step changes its output, so cached frames
+# built by an older version are rebuilt
+CLEANING_VERSION = 9
+
+SEPARATOR = '\n\n\n\n\n\n'
+
+# text columns that get a normalized '<column>_norm' shadow column for matching
+NORMALIZED_COLUMNS = ('description', 'product_details')
+NORMALIZED_SUFFIX = '_norm'
+
+_whitespace_re = re.compile(r'\s+')
+
+
+# text normalizers: plain module-level functions so they can be shipped to
+# worker processes
+
+def replace_separators(text):
+    """Replace the '\\n\\n\\n\\n\\n\\n' separators left by the scrape with ', '."""
+    return text.replace(SEPARATOR, ', ')
+
+
+def normalize_unicode(text):
+    """Fold compatibility characters (e.g. full-width letters) with NFKC."""
+    return unicodedata.normalize('NFKC', text)
+
+
+def collapse_whitespace(text):
+    """Collapse whitespace runs to single spaces and trim the ends."""
+    return _whitespace_re.sub(' ', text).strip()
+
+
+def lowercase(text):
+    """Lowercase ``text`` for case-insensitive matching (as Arrow's ``utf8_lower``)."""
+    return text.lower()
+
+
+def strip_accents(text):
+    """Drop nonspacing marks (category Mn) after NFKD decomposition ('café' -> 'cafe').
+
+    The same rule as the Arrow kernel's ``\\p{Mn}``, so keywords and shadow
+    columns normalize alike.
+    """
+    decomposed = unicodedata.normalize('NFKD', text)
+    return ''.join(ch for ch in decomposed if unicodedata.category(ch) != 'Mn')
+
+
+# casefolded, accent-stripped and whitespace-collapsed text for matching
+MATCH_NORMALIZERS = (lowercase, strip_accents, collapse_whitespace)
+
+
+def normalize_text(text):
+    """Apply ``MATCH_NORMALIZERS`` to one string, e.g. a search keyword."""
+    for normalize in MATCH_NORMALIZERS:
+        text = normalize(text)
+    return text
+
+
+def _apply(texts, normalizers):
+    out = []
+    for text in texts:
+        if isinstance(text, str):
+            for normalize in normalizers:
+                text = normalize(text)
+        out.append(text)
+    return out
+
+
+# RE2's \s is ASCII-only; add the rest of what Python's \s matches
+_ARROW_WHITESPACE = r'[\s\v\x{1c}-\x{1f}\x{85}\p{Z}]+'
+ARROW_NORMALIZERS = (replace_separators, normalize_unicode, collapse_whitespace, lowercase, strip_accents)
+
+
+def _arrow_kernels():
+    import pyarrow.compute as pc
+
+    return {
+        replace_separators: lambda a: pc.replace_substring(a, SEPARATOR, ', '),
+        normalize_unicode: lambda a: pc.utf8_normalize(a, 'NFKC'),
+        collapse_whitespace: lambda a: pc.utf8_trim_whitespace(pc.replace_substring_regex(a, _ARROW_WHITESPACE, ' ')),
+        lowercase: pc.utf8_lower,
+        strip_accents: lambda a: pc.replace_substring_regex(pc.utf8_normalize(a, 'NFKD'), r'\p{Mn}', ''),
+    }
+
+
+def _clean_arrow(array, normalizers):
+    """Run ``normalizers`` as Arrow kernels over the string ``array``."""
+    kernels = _arrow_kernels()
+    missing = [n.__name__ for n in normalizers if n not in kernels]
+    if missing:
+        raise ValueError(f"no Arrow kernel for {', '.join(missing)}")
+    for normalize in normalizers:
+        array = kernels[normalize](array)
+    return array
+
+
+def clean_text(texts, normalizers=(replace_separators,), workers=1, chunksize=50_000, engine='auto'):
+    """Run ``normalizers`` over the Series ``texts``, preserving its order.
+
+    With ``engine='arrow'`` the built-in normalizers (``ARROW_NORMALIZERS``)
+    run as vectorized Arrow string kernels. With ``engine='process'`` they
+    run as Python functions, split into ``chunksize`` partitions that a
+    pool of ``workers`` processes (``None``: all cores) normalizes in
+    parallel when ``workers > 1``. ``'auto'`` uses Arrow when every
+    normalizer has a kernel and the Python path otherwise. Missing values
+    pass through unchanged.
+    """
+    if engine == 'auto':
+        engine = 'arrow' if all(n in ARROW_NORMALIZERS for n in normalizers) else 'process'
+    if engine == 'arrow':
+        import pyarrow as pa
+
+        if texts.dtype == object:
+            array = pa.array(texts, type=pa.large_string(), from_pandas=True)
+        else:
+            array = pa.array(texts.astype(str) if isinstance(texts.dtype, pd.CategoricalDtype) else texts,
+                             from_pandas=True)
+        array = _clean_arrow(array, normalizers)
+        # take the values, not the Series: its fresh RangeIndex would realign
+        return pd.Series(array.to_pandas().array, index=texts.index, name=texts.name)
+    if engine != 'process':
+        raise ValueError(f'unknown cleaning engine {engine!r}')
+
+    values = texts.tolist()
+    normalizers = tuple(normalizers)
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(values) <= chunksize:
+        cleaned = _apply(values, normalizers)
+    else:
+        parts = [values[i:i + chunksize] for i in range(0, len(values), chunksize)]
+        cleaned = []
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            # map() yields in submission order, so the output order is deterministic
+            for part in pool.map(_apply, parts, [normalizers] * len(parts)):
+                cleaned.extend(part)
+    return pd.Series(cleaned, index=texts.index, name=texts.name)
+
+
+def clean_product_details(product_details, workers=1, engine='auto'):
+    """Replace the '\\n\\n\\n\\n\\n\\n' separators left by the scrape with ', '."""
+    return clean_text(product_details, (replace_separators,), workers=workers, engine=engine)
+
+
+def add_normalized_columns(etsy, columns=NORMALIZED_COLUMNS, workers=1):
+    """Add a ``<column>_norm`` shadow column of ``MATCH_NORMALIZERS`` output.
+
+    Case-insensitive segment filters match against these once-computed
+    columns instead of lowercasing the text again for every keyword.
+    """
+    for column in columns:
+        etsy[column + NORMALIZED_SUFFIX] = clean_text(etsy[column], MATCH_NORMALIZERS, workers=workers)
+    return etsy
+
+
+def clean_etsy(etsy, workers=1, engine='auto', normalized=False):
+    """Return a cleaned copy of the loaded Etsy frame.
+
+    With ``normalized`` the normalized shadow columns used for
+    case-insensitive matching are added too; without them normalized
+    matching normalizes the text on the fly. ``workers`` and ``engine``
+    are passed on to ``clean_text``.
+    """
+    etsy = etsy.copy()
+    etsy['product_details'] = clean_product_details(etsy['product_details'], workers, engine)
+    if normalized:
+        etsy = add_normalized_columns(etsy, workers=workers)
+    return etsy
@@ -0,0 +1,63 @@
+"""Command-line entry point: ``python -m chienchien etsy.json --out report/``."""
+
+import argparse
+
+from .analysis import open_engine, rank_sellers, run_segments, write_report, write_tables
+from .backends import BACKENDS, run_pipeline
+from .cache import DEFAULT_CACHE_DIR
+from .instrument import NullTracer, Tracer
+from .segments import AREAS_OF_INTEREST, load_segments
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='python -m chienchien', description='Run the Chien-Chien Etsy segment analysis.')
+    parser.add_argument('path', nargs='?', default='etsy.json', help='the Etsy scrape (JSON array or JSON Lines)')
+    parser.add_argument('--segments', help='JSON segment spec (default: the Areas of Interest)')
+    parser.add_argument('--out', help='write every table, brand list and chart to this directory '
+                                      '(default: print a summary)')
+    parser.add_argument('--cache-dir', default=DEFAULT_CACHE_DIR)
+    parser.add_argument('--backend', choices=BACKENDS,
+                        help='compute the tables with this run_pipeline backend instead of the cached engine '
+                             '(tables only: no seller ranking or charts)')
+    parser.add_argument('--case-sensitive', action='store_true',
+                        help='match keywords exactly (default: ignore case, accents and whitespace)')
+    parser.add_argument('-k', type=int, default=10, help='leaderboard size per segment')
+    parser.add_argument('--rank-by', choices=('rating_score', 'average_rating'),
+                        help='leaderboard ranking, the same with or without --backend (default: rating_score; '
+                             'average_rating with --backend chunked, which cannot compute rating_score)')
+    parser.add_argument('--min-reviews', type=int, default=0)
+    parser.add_argument('--no-charts', action='store_true', help='skip the charts (Altair not needed)')
+    parser.add_argument('--chart-format', choices=('html', 'json', 'png', 'svg'), default='html')
+    parser.add_argument('--trace', help='write the per-stage timing trace to this JSON file')
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    segments = load_segments(args.segments) if args.segments else AREAS_OF_INTEREST
+    tracer = Tracer() if args.trace else NullTracer()
+    by = args.rank_by or ('average_rating' if args.backend == 'chunked' else 'rating_score')
+    if args.backend:
+        tables = run_pipeline(args.path, segments, args.backend, args.k, by, min_reviews=args.min_reviews,
+                              normalized=not args.case_sensitive, tracer=tracer)
+        if args.out:
+            written = write_tables(tables, args.out, tracer)
+            print(f'wrote {len(written)} files to {args.out}')
+        else:
+            print(tables.price_stats().to_string())
+        if args.trace:
+            tracer.to_json(args.trace)
+        return 0
+    engine = tracer.call('load', open_engine, args.path, segments, args.cache_dir, not args.case_sensitive)
+    if args.out:
+        written = write_report(engine, args.out, args.k, args.min_reviews, not args.no_charts,
+                               args.chart_format, tracer, by)
+        print(f'wrote {len(written)} files to {args.out}')
+    else:
+        tables = run_segments(engine, args.k, args.min_reviews, tracer, by)
+        print(tables.price_stats().to_string())
+        print()
+        print(rank_sellers(engine).head(args.k).to_string())
+    if args.trace:
+        tracer.to_json(args.trace)
+    return 0
@@ -0,0 +1,50 @@
+"""Compact dtypes for the loaded Etsy frame."""
+
+import numpy as np
+import pandas as pd
+
+# string columns with at most this share of distinct values become categorical
+MAX_CATEGORY_RATIO = 0.5
+
+
+def _downcast_numeric(column):
+    if pd.api.types.is_integer_dtype(column):
+        info = np.iinfo(np.int32)
+        if column.min() >= info.min and column.max() <= info.max:
+            return column.astype(np.int32)
+    # floats keep float64: a float32 price of 559.52 reports as 559.520020
+    return column
+
+
+def optimize_dtypes(etsy, max_category_ratio=MAX_CATEGORY_RATIO):
+    """Return a copy of ``etsy`` with compact dtypes.
+
+    Low-cardinality string columns such as ``brand`` and ``category`` become
+    ``category`` (so ``unique()`` and group-bys work on integer codes) and
+    integer columns such as ``reviews_count`` become int32. Floats such as
+    ``price`` and ``average_rating`` keep float64, so reported statistics
+    carry no float32 rounding noise.
+    """
+    etsy = etsy.copy()
+    for name, column in etsy.items():
+        if pd.api.types.is_bool_dtype(column) or isinstance(column.dtype, pd.CategoricalDtype):
+            continue
+        if pd.api.types.is_numeric_dtype(column):
+            etsy[name] = _downcast_numeric(column)
+        elif pd.api.types.is_string_dtype(column) or pd.api.types.is_object_dtype(column):
+            if len(column) and column.nunique() <= max_category_ratio * len(column):
+                etsy[name] = column.astype('category')
+    return etsy
+
+
+def memory_report(before, after):
+    """Compare the deep memory usage of two versions of the same frame."""
+    report = pd.DataFrame({
+        'before': before.memory_usage(deep=True, index=False),
+        'after': after.memory_usage(deep=True, index=False),
+    })
+    report.loc['total'] = report.sum()
+    report['saved'] = report['before'] - report['after']
+    report['saved_pct'] = (100 * report['saved'] / report['before']).round(1)
+    report.insert(0, 'dtype', [str(before[c].dtype) + ' -> ' + str(after[c].dtype) for c in before] + [''])
+    return report
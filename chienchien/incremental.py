@@ -0,0 +1,283 @@
+"""Incremental ingestion of repeated scrapes, keyed on listing identity."""
+
+import json
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from .brands import BrandRollup
+from .cleaning import clean_etsy
+from .index import InvertedIndex
+from .loader import ANALYSIS_COLUMNS, load_etsy
+from .segments import AREAS_OF_INTEREST, SegmentEngine, dump_segments, load_segments
+from .stats import DESCRIBE_COLUMNS, describe_segments
+
+INCREMENTAL_COLUMNS = ANALYSIS_COLUMNS + ('scraped_at',)
+# the scrape carries no listing id, so a listing is its shop plus its title
+IDENTITY_COLUMNS = ('brand', 'description')
+# text changes re-run matching and indexing, value changes are patched in place
+TEXT_COLUMNS = ('description', 'product_details')
+VALUE_COLUMNS = ('price', 'category', 'average_rating', 'reviews_count')
+# superseded rows are compacted away once they make up this share of storage
+MAX_DEAD_RATIO = 0.25
+
+
+def _hash_rows(frame):
+    return pd.util.hash_pandas_object(frame.astype(object), index=False).to_numpy()
+
+
+def listing_keys(frame, columns=IDENTITY_COLUMNS):
+    """Return a uint64 identity for every row of ``frame``.
+
+    Rows are identified by ``columns``; repeats of the same values (a shop
+    listing one title several times) are told apart by their order.
+    """
+    identity = frame[list(columns)].astype(object)
+    occurrence = identity.groupby(list(columns), sort=False, dropna=False).cumcount()
+    return _hash_rows(identity.assign(occurrence=occurrence.to_numpy()))
+
+
+def prepare_scrape(scrape, key_columns=IDENTITY_COLUMNS):
+    """Add ``listing_key`` and ``text_hash`` to a raw scrape and parse ``scraped_at``."""
+    scrape = scrape.reset_index(drop=True)
+    scrape['scraped_at'] = pd.to_datetime(scrape['scraped_at'], format='ISO8601')
+    scrape['listing_key'] = listing_keys(scrape, key_columns)
+    scrape['text_hash'] = _hash_rows(scrape[list(TEXT_COLUMNS)])
+    return scrape
+
+
+@dataclass
+class ScrapeDelta:
+    """Listing keys a scrape adds, changes or removes.
+
+    ``changed`` listings only differ in ``VALUE_COLUMNS``; ``rewritten``
+    ones changed their text, so their segment memberships may differ.
+    """
+
+    added: np.ndarray
+    changed: np.ndarray
+    rewritten: np.ndarray
+    removed: np.ndarray
+
+    def __len__(self):
+        return len(self.added) + len(self.changed) + len(self.rewritten) + len(self.removed)
+
+
+def _differs(old, new):
+    old = np.asarray(old, dtype=object)
+    new = np.asarray(new, dtype=object)
+    return (old != new) & ~(pd.isna(old) & pd.isna(new))
+
+
+def diff_scrape(current, scrape, full=True):
+    """Compare a prepared ``scrape`` with the ``current`` live listings.
+
+    A listing both sides share counts as changed only when the scrape is
+    not older than the stored version. With ``full`` the scrape covers the
+    whole catalogue, so listings missing from it are removed; a partial
+    scrape never removes anything.
+    """
+    old = pd.Series(np.arange(len(current)), index=current['listing_key'].to_numpy())
+    new_keys = scrape['listing_key'].to_numpy()
+    known = np.isin(new_keys, old.index.to_numpy())
+
+    old_rows = old.loc[new_keys[known]].to_numpy()
+    previous = current.iloc[old_rows]
+    latest = scrape[known]
+    fresh = ~(latest['scraped_at'].to_numpy() < previous['scraped_at'].to_numpy())
+    rewritten = fresh & (latest['text_hash'].to_numpy() != previous['text_hash'].to_numpy())
+    changed = np.zeros(len(latest), dtype=bool)
+    for column in VALUE_COLUMNS:
+        changed |= _differs(previous[column], latest[column])
+    changed &= fresh & ~rewritten
+
+    if full:
+        removed = np.setdiff1d(old.index.to_numpy(), new_keys, assume_unique=True)
+    else:
+        removed = np.empty(0, dtype=np.uint64)
+    shared = new_keys[known]
+    return ScrapeDelta(
+        added=new_keys[~known],
+        changed=shared[changed],
+        rewritten=shared[rewritten],
+        removed=removed,
+    )
+
+
+class IncrementalCatalogue:
+    """The cleaned catalogue with its derived state, kept current scrape by scrape.
+
+    Rows are stored append-only: a listing whose values change is patched
+    in place, while a new or rewritten listing is cleaned, matched and
+    indexed on its own and appended, leaving its previous version behind
+    as a dead row. Segment masks, the ``BrandRollup``, the per-segment
+    ``describe()`` table and the optional ``InvertedIndex`` are updated
+    only for the segments and brands the delta touches, so the cost of a
+    daily refresh follows the number of changed listings rather than the
+    catalogue size. Dead rows are compacted away past ``MAX_DEAD_RATIO``.
+    """
+
+    def __init__(self, segments=AREAS_OF_INTEREST, normalized=False, index_columns=None,
+                 key_columns=IDENTITY_COLUMNS):
+        self.segments = tuple(segments)
+        self.normalized = normalized
+        self.index_columns = tuple(index_columns) if index_columns else None
+        self.key_columns = tuple(key_columns)
+        self.names = [segment.name for segment in self.segments]
+        self.etsy = None
+        self.live = np.zeros(0, dtype=bool)
+        self.masks = np.zeros((0, len(self.names)), dtype=bool)
+        self.index = None
+        self.rollup = BrandRollup()
+        self.describe = None
+
+    @classmethod
+    def build(cls, path, segments=AREAS_OF_INTEREST, normalized=False, index_columns=None):
+        """Create a catalogue from the scrape at ``path``."""
+        catalogue = cls(segments, normalized, index_columns)
+        catalogue.ingest(path)
+        return catalogue
+
+    def frame(self):
+        """Return the live listings."""
+        return self.etsy[self.live]
+
+    def segment_masks(self):
+        """Return the live rows x segments boolean membership matrix."""
+        return pd.DataFrame(self.masks[self.live], index=self.etsy.index[self.live], columns=self.names)
+
+    def engine(self):
+        """Return a ``SegmentEngine`` over the live listings that reuses the stored masks."""
+        engine = SegmentEngine(self.frame(), self.segments, self.normalized)
+        engine._masks = self.segment_masks()
+        return engine
+
+    def query(self, expression, column='description'):
+        """Return the live-row mask of an index query (see ``InvertedIndex.query``)."""
+        if self.index is None:
+            raise ValueError('the catalogue was created without index_columns')
+        return self.index.mask(expression, column)[self.live]
+
+    def ingest(self, scrape, full=True):
+        """Apply a new scrape (a path or a loaded frame) and return its ``ScrapeDelta``.
+
+        ``full`` says the scrape covers the whole catalogue (see
+        ``diff_scrape``).
+        """
+        if not isinstance(scrape, pd.DataFrame):
+            scrape = load_etsy(scrape, INCREMENTAL_COLUMNS)
+        scrape = prepare_scrape(scrape, self.key_columns)
+        if self.etsy is None:
+            delta = ScrapeDelta(scrape['listing_key'].to_numpy(), *[np.empty(0, dtype=np.uint64)] * 3)
+        else:
+            delta = diff_scrape(self.frame(), scrape, full)
+        if not len(delta):
+            return delta
+
+        positions = self._positions()
+        by_key = scrape.set_index('listing_key')
+        touched = []
+
+        # value-only changes: patch the stored rows, memberships stay as they are
+        if len(delta.changed):
+            rows = positions.loc[delta.changed].to_numpy()
+            touched.append(rows)
+            for column in VALUE_COLUMNS + ('scraped_at',):
+                self.etsy.loc[rows, column] = by_key.loc[delta.changed, column].to_numpy()
+
+        # removed and rewritten listings leave dead rows behind
+        superseded = positions.loc[np.concatenate([delta.removed, delta.rewritten])].to_numpy()
+        self.live[superseded] = False
+        touched.append(superseded)
+
+        # new versions are the only rows cleaned, matched and indexed
+        incoming = np.concatenate([delta.added, delta.rewritten])
+        if len(incoming):
+            rows = clean_etsy(by_key.loc[incoming].reset_index(), normalized=self.normalized)
+            start = 0 if self.etsy is None else len(self.etsy)
+            rows.index = pd.RangeIndex(start, start + len(rows))
+            masks = SegmentEngine(rows, self.segments, self.normalized).masks().to_numpy()
+            if self.index_columns:
+                self.index = InvertedIndex.build(rows, self.index_columns) if self.index is None \
+                    else self.index.extend(rows)
+            self.etsy = rows if self.etsy is None else pd.concat([self.etsy, rows])
+            self.live = np.concatenate([self.live, np.ones(len(rows), dtype=bool)])
+            self.masks = np.concatenate([self.masks, masks])
+            touched.append(np.arange(start, start + len(rows)))
+
+        touched = np.concatenate(touched)
+        brands = set(self.etsy['brand'].to_numpy()[touched])
+        segments = [name for name, hit in zip(self.names, self.masks[touched].any(axis=0)) if hit]
+        if len(self.live) and (~self.live).mean() > MAX_DEAD_RATIO:
+            self.compact()
+        self._refresh(brands, segments)
+        return delta
+
+    def _positions(self):
+        """Map the key of every live listing to its stored row."""
+        if self.etsy is None:
+            return pd.Series([], dtype=np.int64)
+        rows = np.flatnonzero(self.live)
+        return pd.Series(rows, index=self.etsy['listing_key'].to_numpy()[rows])
+
+    def _refresh(self, brands, segments):
+        etsy, masks = self.frame(), self.segment_masks()
+        self.rollup.recompute(etsy, brands, masks)
+        if self.describe is None:
+            self.describe = describe_segments(etsy, masks)
+        elif segments:
+            updated = describe_segments(etsy, masks[segments])
+            self.describe = self.describe.drop(index=segments, level='segment')
+            order = pd.MultiIndex.from_product([self.names, list(DESCRIBE_COLUMNS)], names=['segment', 'column'])
+            self.describe = pd.concat([self.describe, updated]).reindex(order)
+
+    def compact(self):
+        """Drop the dead rows and renumber the live ones."""
+        keep = self.live
+        self.etsy = self.etsy[keep].reset_index(drop=True)
+        self.masks = self.masks[keep]
+        if self.index is not None:
+            self.index = self.index.compact(keep)
+        self.live = np.ones(len(self.etsy), dtype=bool)
+
+    def save(self, directory):
+        """Write the catalogue and its derived state to ``directory``."""
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        pq.write_table(pa.Table.from_pandas(self.etsy, preserve_index=False), directory / 'listings.parquet')
+        np.savez(directory / 'state.npz', live=self.live, masks=self.masks)
+        if self.index is not None:
+            self.index.save(directory / 'index.npz')
+        self.rollup.save(directory / 'brands.json')
+        dump_segments(self.segments, directory / 'segments.json')
+        with open(directory / 'catalogue.json', 'w') as f:
+            json.dump({
+                'normalized': self.normalized,
+                'index_columns': self.index_columns,
+                'key_columns': self.key_columns,
+            }, f)
+
+    @classmethod
+    def load(cls, directory):
+        """Read a catalogue written by ``save``."""
+        import pyarrow.parquet as pq
+
+        directory = Path(directory)
+        with open(directory / 'catalogue.json') as f:
+            settings = json.load(f)
+        catalogue = cls(load_segments(directory / 'segments.json'), settings['normalized'],
+                        settings['index_columns'], settings['key_columns'])
+        catalogue.etsy = pq.read_table(directory / 'listings.parquet').to_pandas()
+        with np.load(directory / 'state.npz') as state:
+            catalogue.live = state['live']
+            catalogue.masks = state['masks']
+        if catalogue.index_columns:
+            catalogue.index = InvertedIndex.load(directory / 'index.npz')[0]
+        catalogue.rollup = BrandRollup.load(directory / 'brands.json')
+        catalogue.describe = describe_segments(catalogue.frame(), catalogue.segment_masks())
+        return catalogue
@@ -0,0 +1,247 @@
+"""Positional inverted index over the Etsy text columns."""
+
+import re
+
+import numpy as np
+
+from .cache import DEFAULT_CACHE_DIR, _cache_paths, _read_meta, fingerprint, load_cached
+from .cleaning import CLEANING_VERSION
+
+# bump whenever tokenization or the on-disk layout changes
+INDEX_VERSION = 1
+INDEXED_COLUMNS = ('description', 'product_details')
+
+_token_re = re.compile(r'\w+')
+_query_re = re.compile(r'"[^"]*"|[()]|[^\s()"]+')
+
+
+def tokenize(text):
+    """Split ``text`` into casefolded word tokens."""
+    return _token_re.findall(text.casefold())
+
+
+class _Field:
+    """Postings for one column: token -> (row ids, positions), CSR style."""
+
+    def __init__(self, vocab, offsets, rows, positions):
+        self.vocab = vocab
+        self.offsets = offsets
+        self.rows = rows
+        self.positions = positions
+        self.stride = int(positions.max()) + 1 if len(positions) else 1
+
+    @classmethod
+    def build(cls, texts):
+        vocab = {}
+        token_ids, rows, positions = [], [], []
+        for row, text in enumerate(texts):
+            if not isinstance(text, str):
+                continue
+            for pos, token in enumerate(tokenize(text)):
+                token_ids.append(vocab.setdefault(token, len(vocab)))
+                rows.append(row)
+                positions.append(pos)
+        return cls._from_postings(
+            vocab,
+            np.asarray(token_ids, dtype=np.int64),
+            np.asarray(rows, dtype=np.int64),
+            np.asarray(positions, dtype=np.int64),
+        )
+
+    @classmethod
+    def _from_postings(cls, vocab, token_ids, rows, positions):
+        # rows/positions are already ascending per token, a stable sort keeps them so
+        order = np.argsort(token_ids, kind='stable')
+        offsets = np.zeros(len(vocab) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(token_ids, minlength=len(vocab)), out=offsets[1:])
+        return cls(vocab, offsets, rows[order], positions[order])
+
+    def _token_ids(self):
+        return np.repeat(np.arange(len(self.vocab), dtype=np.int64), np.diff(self.offsets))
+
+    def extend(self, texts, first_row):
+        """Return this field with ``texts`` appended as rows ``first_row`` onwards.
+
+        Only the new texts are tokenized; the existing postings are merged
+        in with array operations.
+        """
+        added = _Field.build(texts)
+        vocab = dict(self.vocab)
+        mapping = np.array([vocab.setdefault(token, len(vocab)) for token in added.vocab], dtype=np.int64)
+        return _Field._from_postings(
+            vocab,
+            np.concatenate([self._token_ids(), mapping[added._token_ids()]]),
+            np.concatenate([self.rows, added.rows + first_row]),
+            np.concatenate([self.positions, added.positions]),
+        )
+
+    def remap(self, new_rows):
+        """Return this field with row ``r`` renumbered ``new_rows[r]``.
+
+        Rows mapped to -1 are dropped; ``new_rows`` must keep the surviving
+        rows in order.
+        """
+        rows = new_rows[self.rows]
+        keep = rows >= 0
+        offsets = np.zeros(len(self.vocab) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(self._token_ids()[keep], minlength=len(self.vocab)), out=offsets[1:])
+        return _Field(self.vocab, offsets, rows[keep], self.positions[keep])
+
+    def _postings(self, token):
+        token_id = self.vocab.get(token)
+        if token_id is None:
+            return None
+        start, stop = self.offsets[token_id], self.offsets[token_id + 1]
+        return self.rows[start:stop], self.positions[start:stop]
+
+    def lookup(self, term):
+        """Return the sorted row ids containing ``term`` (a word or phrase)."""
+        tokens = tokenize(term)
+        if not tokens:
+            return np.empty(0, dtype=np.int64)
+        keys = None
+        for offset, token in enumerate(tokens):
+            postings = self._postings(token)
+            if postings is None:
+                return np.empty(0, dtype=np.int64)
+            rows, positions = postings
+            if len(tokens) == 1:
+                return np.unique(rows)
+            # align every token on the phrase start position
+            starts = positions >= offset
+            token_keys = rows[starts] * self.stride + (positions[starts] - offset)
+            keys = token_keys if keys is None else np.intersect1d(keys, token_keys, assume_unique=True)
+        return np.unique(keys // self.stride)
+
+
+class InvertedIndex:
+    """Token -> sorted row-id postings for each indexed column.
+
+    Terms are casefolded whole words, so 'Gift' also finds 'gift' but not
+    'Gifts'. Multi-word terms such as 'handmade paper' are matched as
+    phrases using token positions. Row ids are positions in the indexed
+    frame (``etsy.iloc[rows]``).
+    """
+
+    def __init__(self, fields, n_rows):
+        self.fields = fields
+        self.n_rows = n_rows
+
+    @classmethod
+    def build(cls, etsy, columns=INDEXED_COLUMNS):
+        fields = {column: _Field.build(etsy[column]) for column in columns}
+        return cls(fields, len(etsy))
+
+    def extend(self, rows):
+        """Return an index that also covers ``rows``, appended after the indexed ones."""
+        fields = {column: field.extend(rows[column], self.n_rows) for column, field in self.fields.items()}
+        return type(self)(fields, self.n_rows + len(rows))
+
+    def compact(self, keep):
+        """Return the index of only the rows where the boolean ``keep`` is set, renumbered."""
+        keep = np.asarray(keep, dtype=bool)
+        new_rows = np.cumsum(keep) - 1
+        new_rows[~keep] = -1
+        fields = {column: field.remap(new_rows) for column, field in self.fields.items()}
+        return type(self)(fields, int(keep.sum()))
+
+    def lookup(self, term, column='description'):
+        """Return the sorted row ids whose ``column`` contains ``term``."""
+        return self.fields[column].lookup(term)
+
+    def query(self, expression, column='description'):
+        """Resolve a keyword query such as ``Gift AND (Painting OR Paper)``.
+
+        Operands are words or double-quoted phrases; ``AND`` binds tighter
+        than ``OR`` and adjacent operands are ANDed.
+        """
+        tokens = [m.group(0) for m in _query_re.finditer(expression)]
+        rows, pos = self._parse_or(tokens, 0, column)
+        if pos != len(tokens):
+            raise ValueError(f'unexpected {tokens[pos]!r} in query {expression!r}')
+        return rows
+
+    def mask(self, expression, column='description'):
+        """Return a boolean row mask for ``query(expression, column)``."""
+        mask = np.zeros(self.n_rows, dtype=bool)
+        mask[self.query(expression, column)] = True
+        return mask
+
+    def _parse_or(self, tokens, pos, column):
+        rows, pos = self._parse_and(tokens, pos, column)
+        while pos < len(tokens) and tokens[pos] == 'OR':
+            other, pos = self._parse_and(tokens, pos + 1, column)
+            rows = np.union1d(rows, other)
+        return rows, pos
+
+    def _parse_and(self, tokens, pos, column):
+        rows, pos = self._parse_atom(tokens, pos, column)
+        while pos < len(tokens) and tokens[pos] not in ('OR', ')'):
+            if tokens[pos] == 'AND':
+                pos += 1
+            other, pos = self._parse_atom(tokens, pos, column)
+            rows = np.intersect1d(rows, other, assume_unique=True)
+        return rows, pos
+
+    def _parse_atom(self, tokens, pos, column):
+        if pos >= len(tokens):
+            raise ValueError('query ended unexpectedly')
+        token = tokens[pos]
+        if token == '(':
+            rows, pos = self._parse_or(tokens, pos + 1, column)
+            if pos >= len(tokens) or tokens[pos] != ')':
+                raise ValueError('unbalanced parentheses in query')
+            return rows, pos + 1
+        if token in ('AND', 'OR', ')'):
+            raise ValueError(f'unexpected {token!r} in query')
+        return self.lookup(token.strip('"'), column), pos + 1
+
+    def save(self, path, version=''):
+        """Write the index to a single ``.npz`` file tagged with ``version``."""
+        arrays = {'n_rows': np.int64(self.n_rows), 'version': np.str_(version)}
+        for i, (column, field) in enumerate(self.fields.items()):
+            arrays[f'column_{i}'] = np.str_(column)
+            arrays[f'vocab_{i}'] = np.array(list(field.vocab), dtype=str)
+            arrays[f'offsets_{i}'] = field.offsets
+            arrays[f'rows_{i}'] = field.rows
+            arrays[f'positions_{i}'] = field.positions
+        with open(path, 'wb') as f:
+            np.savez(f, **arrays)
+
+    @classmethod
+    def load(cls, path):
+        """Read an index written by ``save``; returns ``(index, version)``."""
+        with np.load(path) as data:
+            fields = {}
+            i = 0
+            while f'column_{i}' in data:
+                vocab = {token: n for n, token in enumerate(data[f'vocab_{i}'].tolist())}
+                fields[str(data[f'column_{i}'])] = _Field(
+                    vocab, data[f'offsets_{i}'], data[f'rows_{i}'], data[f'positions_{i}']
+                )
+                i += 1
+            return cls(fields, int(data['n_rows'])), str(data['version'])
+
+
+def load_index(path='etsy.json', cache_dir=DEFAULT_CACHE_DIR, columns=INDEXED_COLUMNS):
+    """Return the inverted index for the data set at ``path``.
+
+    The index is built once per dataset version (source content hash plus
+    cleaning and index versions) and reused from ``cache_dir`` afterwards.
+    """
+    data_path, meta_path = _cache_paths(path, cache_dir)
+    index_path = data_path.with_suffix('.index.npz')
+    meta = _read_meta(meta_path)
+    source = fingerprint(path, meta['source'] if meta else None)
+    version = f"{source['sha256']}:{CLEANING_VERSION}:{INDEX_VERSION}:{','.join(columns)}"
+    if index_path.exists():
+        index, built_for = InvertedIndex.load(index_path)
+        if built_for == version:
+            return index
+
+    index = InvertedIndex.build(load_cached(path, cache_dir), columns)
+    index_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = index_path.with_name(index_path.name + '.tmp')
+    index.save(tmp, version)
+    tmp.replace(index_path)
+    return index
@@ -0,0 +1,118 @@
+"""Per-stage timing, row-count and memory instrumentation."""
+
+import cProfile
+import json
+import os
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+
+def _rss_bytes():
+    """Current resident set size, or ``None`` where /proc is unavailable."""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def _max_rss_bytes():
+    """Peak resident set size, or ``None`` where ``resource`` is unavailable (Windows)."""
+    try:
+        import resource
+    except ImportError:
+        return None
+    usage = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return usage if sys.platform == 'darwin' else usage * 1024
+
+
+class Tracer:
+    """Record wall/CPU time, rows in/out and memory for each pipeline stage.
+
+    Wrap stages with ``stage()`` (or ``call()``); ``records`` then holds one
+    dict per stage and ``to_json()`` gives the structured trace. With
+    ``trace_memory`` the tracemalloc delta and peak of each stage are
+    recorded (at some cost in speed); with ``profile`` every stage also runs
+    under one shared cProfile profiler, dumped with ``dump_profile()``.
+    """
+
+    def __init__(self, trace_memory=False, profile=False):
+        self.trace_memory = trace_memory
+        self.records = []
+        self.profiler = cProfile.Profile() if profile else None
+
+    @contextmanager
+    def stage(self, name, rows_in=None):
+        """Time the enclosed block; set ``record['rows_out']`` inside it."""
+        record = {'stage': name, 'rows_in': rows_in, 'rows_out': None}
+        started_tracing = False
+        if self.trace_memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                started_tracing = True
+            tracemalloc.reset_peak()
+            traced_before = tracemalloc.get_traced_memory()[0]
+        rss_before = _rss_bytes()
+        wall, cpu = time.perf_counter(), time.process_time()
+        if self.profiler is not None:
+            self.profiler.enable()
+        try:
+            yield record
+        finally:
+            if self.profiler is not None:
+                self.profiler.disable()
+            record['wall_seconds'] = round(time.perf_counter() - wall, 6)
+            record['cpu_seconds'] = round(time.process_time() - cpu, 6)
+            rss_after = _rss_bytes()
+            record['rss_delta_bytes'] = None if rss_before is None else rss_after - rss_before
+            record['max_rss_bytes'] = _max_rss_bytes()
+            if self.trace_memory:
+                current, peak = tracemalloc.get_traced_memory()
+                record['traced_delta_bytes'] = current - traced_before
+                record['traced_peak_bytes'] = peak - traced_before
+                if started_tracing:
+                    tracemalloc.stop()
+            self.records.append(record)
+
+    def call(self, name, func, *args, rows_in=None, **kwargs):
+        """Run ``func(*args, **kwargs)`` as stage ``name`` and return its result.
+
+        ``rows_out`` is the result's length when it has one.
+        """
+        with self.stage(name, rows_in) as record:
+            result = func(*args, **kwargs)
+            try:
+                record['rows_out'] = len(result)
+            except TypeError:
+                pass
+        return result
+
+    def to_json(self, path=None):
+        """Return the trace as JSON, also writing it to ``path`` if given."""
+        text = json.dumps({'stages': self.records}, indent=2)
+        if path is not None:
+            with open(path, 'w') as f:
+                f.write(text)
+        return text
+
+    def dump_profile(self, path):
+        """Write the cProfile statistics (readable with ``pstats``) to ``path``."""
+        if self.profiler is None:
+            raise ValueError('the tracer was created without profile=True')
+        self.profiler.dump_stats(path)
+
+
+class NullTracer:
+    """A ``Tracer`` stand-in that records nothing."""
+
+    records = ()
+
+    @contextmanager
+    def stage(self, name, rows_in=None):
+        yield {}
+
+    def call(self, name, func, *args, rows_in=None, **kwargs):
+        return func(*args, **kwargs)
@@ -0,0 +1,113 @@
+"""Streaming, column-projected loading of the Etsy scrape."""
+
+import json
+from itertools import islice
+
+import pandas as pd
+
+# the only columns the analysis reads; 'availability', 'images' and
+# 'scraped_at' are never materialized
+ANALYSIS_COLUMNS = (
+    'description',
+    'product_details',
+    'brand',
+    'price',
+    'category',
+    'average_rating',
+    'reviews_count',
+)
+# parsed as numbers in every chunk; like an all-null text column, an
+# all-null chunk would otherwise turn the whole column into objects
+NUMERIC_COLUMNS = ('price', 'average_rating', 'reviews_count')
+
+_decoder = json.JSONDecoder()
+
+
+def _first_char(f):
+    """Return the first non-whitespace character of ``f`` and rewind it."""
+    while True:
+        ch = f.read(1)
+        if not ch or not ch.isspace():
+            f.seek(0)
+            return ch
+
+
+def _iter_array(f, buffer_size):
+    buf = f.read(buffer_size)
+    pos = buf.index('[') + 1
+    while True:
+        # skip the separators between records
+        while pos < len(buf) and (buf[pos].isspace() or buf[pos] == ','):
+            pos += 1
+        if pos < len(buf) and buf[pos] == ']':
+            return
+        try:
+            record, pos = _decoder.raw_decode(buf, pos)
+        except json.JSONDecodeError:
+            more = f.read(buffer_size)
+            if not more:
+                raise
+            buf = buf[pos:] + more
+            pos = 0
+            continue
+        yield record
+
+
+def _iter_lines(f):
+    for line in f:
+        line = line.strip()
+        if line:
+            yield json.loads(line)
+
+
+def iter_records(path, buffer_size=1 << 20):
+    """Yield the records of a JSON array or JSON Lines file one at a time.
+
+    Only ``buffer_size`` characters of raw text (plus one partial record) are
+    held in memory at once, regardless of the file size.
+    """
+    with open(path, encoding='utf-8') as f:
+        if _first_char(f) == '[':
+            yield from _iter_array(f, buffer_size)
+        else:
+            yield from _iter_lines(f)
+
+
+def iter_chunks(path, columns=ANALYSIS_COLUMNS, chunksize=50_000):
+    """Yield DataFrames of at most ``chunksize`` rows holding only ``columns``.
+
+    Each chunk keeps a continuous index, so concatenating the chunks gives
+    the same 0..n-1 index ``pd.read_json`` would. ``NUMERIC_COLUMNS`` are
+    always numeric (values that are not numbers become NaN) and a column
+    that is null throughout a chunk is a string column.
+    """
+    columns = list(columns)
+    records = iter_records(path)
+    start = 0
+    while True:
+        batch = list(islice(records, chunksize))
+        if not batch:
+            return
+        data = {col: [record.get(col) for record in batch] for col in columns}
+        del batch
+        for col, values in data.items():
+            if col in NUMERIC_COLUMNS:
+                data[col] = pd.to_numeric(values, errors='coerce')
+            elif all(value is None for value in values):
+                data[col] = pd.array(values, dtype=str)
+        chunk = pd.DataFrame(data, columns=columns)
+        chunk.index = pd.RangeIndex(start, start + len(chunk))
+        start += len(chunk)
+        yield chunk
+
+
+def load_etsy(path='etsy.json', columns=ANALYSIS_COLUMNS, chunksize=50_000):
+    """Load the Etsy scrape keeping only ``columns``.
+
+    Records are streamed in chunks and projected as they are read, so peak
+    memory is bounded by the projected columns rather than the raw file.
+    """
+    chunks = list(iter_chunks(path, columns, chunksize))
+    if not chunks:
+        return pd.DataFrame(columns=list(columns))
+    return pd.concat(chunks)
@@ -0,0 +1,79 @@
+"""Vectorized multi-keyword matching over a text column."""
+
+import numpy as np
+import pandas as pd
+
+from .cleaning import MATCH_NORMALIZERS, NORMALIZED_SUFFIX, clean_text, normalize_text
+
+
+class KeywordMatcher:
+    """Match many literal keywords against a text column.
+
+    Each keyword is one vectorized Arrow substring scan, the same result
+    as ``str.contains(keyword, regex=False)``. Categorical columns are
+    scanned once per category rather than once per row.
+    """
+
+    def __init__(self, keywords):
+        self.keywords = list(dict.fromkeys(keywords))
+
+    def match(self, texts):
+        """Return a rows x keywords boolean DataFrame for the Series ``texts``.
+
+        Missing texts match nothing.
+        """
+        import pyarrow as pa
+        import pyarrow.compute as pc
+
+        codes = None
+        if isinstance(texts.dtype, pd.CategoricalDtype):
+            codes = texts.cat.codes.to_numpy()
+            values = texts.cat.categories
+        else:
+            values = texts
+        if values.dtype == object:
+            array = pa.array(values, type=pa.large_string(), from_pandas=True)
+        else:
+            array = pa.array(values, from_pandas=True)
+
+        hits = np.zeros((len(texts), len(self.keywords)), dtype=bool)
+        for column, keyword in enumerate(self.keywords):
+            found = pc.match_substring(array, keyword).fill_null(False).to_numpy(zero_copy_only=False)
+            # code -1 (missing) picks the appended False
+            hits[:, column] = found if codes is None else np.append(found, False)[codes]
+        return pd.DataFrame(hits, index=texts.index, columns=self.keywords)
+
+
+def _match_normalized(frame, column, keywords):
+    shadow = column + NORMALIZED_SUFFIX
+    texts = frame[shadow] if shadow in frame else clean_text(frame[column], MATCH_NORMALIZERS)
+    normalized = [normalize_text(keyword) for keyword in keywords]
+    hits = KeywordMatcher(normalized).match(texts)
+    return pd.DataFrame({keyword: hits[norm].to_numpy() for keyword, norm in zip(keywords, normalized)},
+                        index=frame.index)
+
+
+def match_keywords(frame, keywords_by_column, normalized=False):
+    """Match ``{column: [keywords]}`` with one pass per text column.
+
+    With ``normalized=True`` the match is case-, accent- and
+    whitespace-insensitive: keywords are normalized like the
+    ``<column>_norm`` shadow columns and matched against those (or against
+    a normalized copy when the frame has no shadow column).
+
+    Returns a boolean DataFrame whose columns are ``(column, keyword)``.
+    """
+    keywords_by_column = {column: list(dict.fromkeys(kws)) for column, kws in keywords_by_column.items()}
+    if normalized:
+        parts = {
+            column: _match_normalized(frame, column, keywords)
+            for column, keywords in keywords_by_column.items()
+        }
+    else:
+        parts = {
+            column: KeywordMatcher(keywords).match(frame[column])
+            for column, keywords in keywords_by_column.items()
+        }
+    if not parts:
+        return pd.DataFrame(index=frame.index)
+    return pd.concat(parts, axis=1)
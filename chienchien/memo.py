@@ -0,0 +1,272 @@
+"""Memoized per-segment results with dependency-aware invalidation."""
+
+import hashlib
+import pickle
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from .charts import brand_price_chart
+from .matcher import match_keywords
+from .ranking import LEADERBOARD_COLUMNS, top_k_segments
+from .segments import AREAS_OF_INTEREST, SegmentTables
+from .stats import DESCRIBE_COLUMNS, describe_segments
+from .views import SegmentView
+
+# bump a step's version whenever its output changes for the same inputs;
+# entries of the old version are then simply never hit again
+STEP_VERSIONS = {
+    'hit': 1,
+    'mask': 1,
+    'stats': 1,
+    'uniques': 1,
+    'ranking': 1,
+    'chart': 1,
+}
+DEFAULT_MAX_BYTES = 256 * 2**20
+
+
+def frame_fingerprint(etsy):
+    """Return a content hash of ``etsy`` (values and index) for cache keys."""
+    digest = hashlib.sha256(pd.util.hash_pandas_object(etsy, index=True).to_numpy().tobytes())
+    digest.update(repr(list(etsy.columns)).encode())
+    return digest.hexdigest()
+
+
+def _nbytes(value):
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        return int(np.sum(value.memory_usage(deep=True)))
+    return len(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+
+
+class ResultCache:
+    """A size-bounded LRU cache whose entries know what they were derived from.
+
+    ``get_or_compute`` records the keys an entry was computed from; when an
+    entry is invalidated everything derived from it goes too, and nothing
+    else. Eviction drops the least recently used entries once their
+    estimated size passes ``max_bytes``; an evicted entry's dependency
+    links go with it, and what was derived from it stays cached until it
+    is evicted in turn.
+    """
+
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._dependents = {}
+        self._parents = {}
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def get_or_compute(self, key, compute, parents=()):
+        """Return the value cached under ``key``, computing and storing it on a miss."""
+        if key in self._entries:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return self._entries[key][0]
+        self.misses += 1
+        value = compute()
+        size = _nbytes(value)
+        self._entries[key] = (value, size)
+        self.nbytes += size
+        self._parents[key] = tuple(parents)
+        for parent in parents:
+            self._dependents.setdefault(parent, set()).add(key)
+        while self.nbytes > self.max_bytes and len(self._entries) > 1:
+            self._discard(next(iter(self._entries)))
+        return value
+
+    def invalidate(self, key):
+        """Drop ``key`` and, transitively, every entry derived from it; return how many went."""
+        dropped = 0
+        pending = [key]
+        while pending:
+            key = pending.pop()
+            pending.extend(self._dependents.pop(key, ()))
+            if key in self._entries:
+                self._discard(key)
+                dropped += 1
+        return dropped
+
+    def clear(self):
+        self._entries.clear()
+        self._dependents.clear()
+        self._parents.clear()
+        self.nbytes = 0
+
+    def _discard(self, key):
+        _, size = self._entries.pop(key)
+        self.nbytes -= size
+        self._dependents.pop(key, None)
+        for parent in self._parents.pop(key, ()):
+            siblings = self._dependents.get(parent)
+            if siblings is not None:
+                siblings.discard(key)
+                if not siblings:
+                    del self._dependents[parent]
+
+
+class MemoizedEngine:
+    """A ``SegmentEngine`` work-alike whose per-segment outputs are memoized.
+
+    Every step (keyword hit, segment mask, statistics, uniques, leaderboard,
+    chart spec) is cached in a shared ``ResultCache`` under the dataset
+    fingerprint, the segment's definition (not its name) and the step's
+    version. After a spec edit only the steps of segments whose definition
+    changed are recomputed, and keyword scans missing from the cache run
+    together in one pass over each column.
+    """
+
+    def __init__(self, etsy, segments=AREAS_OF_INTEREST, normalized=False, cache=None, fingerprint=None):
+        self.etsy = etsy
+        self.segments = tuple(segments)
+        self.normalized = normalized
+        self.cache = cache if cache is not None else ResultCache()
+        self.fingerprint = fingerprint or frame_fingerprint(etsy)
+
+    def _key(self, step, *inputs):
+        return (step, STEP_VERSIONS[step], *inputs)
+
+    def _hit_key(self, column, keyword):
+        return self._key('hit', self.fingerprint, column, keyword, self.normalized)
+
+    def _mask_key(self, segment):
+        return self._key('mask', self.fingerprint, segment.column, segment.keyword, segment.sub_keyword,
+                         self.normalized)
+
+    def _scan_missing(self):
+        missing = {}
+        for segment in self.segments:
+            for keyword in (segment.keyword, segment.sub_keyword):
+                if keyword is not None and self._hit_key(segment.column, keyword) not in self.cache:
+                    missing.setdefault(segment.column, []).append(keyword)
+        if not missing:
+            return
+        hits = match_keywords(self.etsy, missing, self.normalized)
+        for (column, keyword), hit in hits.items():
+            self.cache.get_or_compute(self._hit_key(column, keyword), hit.to_numpy)
+
+    def _hit(self, column, keyword):
+        return self.cache.get_or_compute(
+            self._hit_key(column, keyword),
+            lambda: match_keywords(self.etsy, {column: [keyword]}, self.normalized).iloc[:, 0].to_numpy(),
+        )
+
+    def mask(self, segment):
+        """Return the boolean member array of ``segment``."""
+        parents = [self._hit_key(segment.column, segment.keyword)]
+        if segment.sub_keyword is not None:
+            parents.append(self._hit_key(segment.column, segment.sub_keyword))
+
+        def compute():
+            mask = self._hit(segment.column, segment.keyword)
+            if segment.sub_keyword is not None:
+                mask = mask & self._hit(segment.column, segment.sub_keyword)
+            return mask
+
+        return self.cache.get_or_compute(self._mask_key(segment), compute, parents)
+
+    def masks(self):
+        """Return the rows x segments boolean membership matrix."""
+        self._scan_missing()
+        return pd.DataFrame({segment.name: self.mask(segment) for segment in self.segments}, index=self.etsy.index)
+
+    def _derived_key(self, step, segment, *params):
+        return self._key(step, self._mask_key(segment), *params)
+
+    def _derived(self, step, segment, compute, *params):
+        return self.cache.get_or_compute(self._derived_key(step, segment, *params), compute,
+                                         [self._mask_key(segment)])
+
+    def _single(self, segment):
+        return pd.DataFrame({'': self.mask(segment)}, index=self.etsy.index)
+
+    def describe(self, columns=DESCRIBE_COLUMNS):
+        """Return the tidy ``(segment, column)`` describe table of every segment.
+
+        Segments missing from the cache are described together in one
+        ``describe_segments`` call, then cached one slice per segment.
+        """
+        self._scan_missing()
+        columns = tuple(columns)
+        missing = list(dict.fromkeys(
+            segment for segment in self.segments if self._derived_key('stats', segment, columns) not in self.cache
+        ))
+        computed = {}
+        if missing:
+            masks = pd.DataFrame({i: self.mask(segment) for i, segment in enumerate(missing)}, index=self.etsy.index)
+            table = describe_segments(self.etsy, masks, columns)
+            computed = {segment: table.xs(i) for i, segment in enumerate(missing)}
+        parts = {
+            segment.name: self._derived(
+                'stats', segment,
+                lambda segment=segment: computed[segment] if segment in computed
+                else describe_segments(self.etsy, self._single(segment), columns).xs(''),
+                columns,
+            )
+            for segment in self.segments
+        }
+        return pd.concat(parts, names=['segment', 'column'])
+
+    def uniques(self, segment):
+        """Return the first-seen ``(categories, brands)`` of ``segment``."""
+        def compute():
+            member = SegmentView.from_mask(self.etsy, self.mask(segment)).frame(['category', 'brand'])
+            return member['category'].unique().tolist(), member['brand'].unique().tolist()
+
+        return self._derived('uniques', segment, compute)
+
+    def leaderboard(self, k=10, by=None, tie_breaker='reviews_count', min_reviews=0):
+        """Return the top-``k`` rows of every segment (see ``top_k_segments``)."""
+        self._scan_missing()
+        boards = []
+        for segment in self.segments:
+            board = self._derived(
+                'ranking', segment,
+                lambda segment=segment: top_k_segments(self.etsy, self._single(segment), k, by, tie_breaker,
+                                                       min_reviews),
+                k, by, tie_breaker, min_reviews,
+            )
+            boards.append(board.assign(segment=segment.name))
+        if not boards:
+            return pd.DataFrame(columns=['segment', 'rank', *LEADERBOARD_COLUMNS])
+        return pd.concat(boards)
+
+    def charts(self, **kwargs):
+        """Return ``{segment: Vega-Lite spec}`` of each segment's ``brand_price_chart``."""
+        self._scan_missing()
+        return {
+            segment.name: self._derived(
+                'chart', segment,
+                lambda segment=segment: brand_price_chart(
+                    SegmentView.from_mask(self.etsy, self.mask(segment)).frame(['brand', 'price']), **kwargs
+                ).to_dict(),
+                tuple(sorted(kwargs.items())),
+            )
+            for segment in self.segments
+        }
+
+    def tables(self, k=10, by=None, tie_breaker='reviews_count', min_reviews=0):
+        """Return the ``SegmentTables`` of every segment."""
+        self._scan_missing()
+        uniques = {segment.name: self.uniques(segment) for segment in self.segments}
+        return SegmentTables(
+            describe=self.describe(),
+            category={name: category for name, (category, _) in uniques.items()},
+            brand={name: brand for name, (_, brand) in uniques.items()},
+            leaderboard=self.leaderboard(k, by, tie_breaker, min_reviews),
+        )
+
+    def invalidate(self, segment):
+        """Forget ``segment``'s mask and everything derived from it; return how many entries went."""
+        return self.cache.invalidate(self._mask_key(segment))
@@ -0,0 +1,64 @@
+"""Top-K seller leaderboards by rating."""
+
+import pandas as pd
+
+LEADERBOARD_COLUMNS = ('brand', 'price', 'category', 'average_rating', 'reviews_count')
+
+
+def _rank_by(frame, by):
+    """Default to the confidence-adjusted ``rating_score`` when it exists."""
+    if by is not None:
+        return by
+    return 'rating_score' if 'rating_score' in frame else 'average_rating'
+
+
+def top_k(frame, k=10, by=None, tie_breaker='reviews_count', min_reviews=0):
+    """Return the ``k`` best rows of ``frame`` by ``by``, then ``tie_breaker``.
+
+    ``by`` defaults to ``rating_score`` (see ``scoring``) when the frame has
+    it and to ``average_rating`` otherwise. Uses partial selection
+    (``nlargest``) instead of sorting the whole frame. Rows with fewer than
+    ``min_reviews`` reviews and rows missing a ranking key are left out,
+    and remaining ties keep their original order.
+    """
+    by = _rank_by(frame, by)
+    if min_reviews:
+        frame = frame[frame['reviews_count'] >= min_reviews]
+    keys = [by] if tie_breaker is None else [by, tie_breaker]
+    # nlargest returns more than k rows when a key has NaNs
+    frame = frame.dropna(subset=keys)
+    return frame.nlargest(k, keys, keep='first').head(k)
+
+
+def top_k_segments(etsy, masks, k=10, by=None, tie_breaker='reviews_count',
+                   min_reviews=0, columns=None):
+    """Return the top-``k`` leaderboard of every segment as one table.
+
+    ``masks`` is the rows x segments membership matrix. Eligibility (which
+    also leaves out rows missing a ranking key) and the ranking keys are
+    computed once over the whole frame; each segment then only runs a
+    partial selection over its own ranking keys. The result has one row
+    per (segment, rank) with the requested ``columns``
+    (``LEADERBOARD_COLUMNS`` plus the ranking column by default).
+    """
+    by = _rank_by(etsy, by)
+    if columns is None:
+        columns = LEADERBOARD_COLUMNS + ((by,) if by not in LEADERBOARD_COLUMNS else ())
+    keys = [by] if tie_breaker is None else [by, tie_breaker]
+    ranking = etsy[keys]
+    # unrated rows are never ranked (nlargest would also overshoot k on them)
+    eligible = ranking.notna().all(axis=1).to_numpy(copy=True)
+    if min_reviews:
+        eligible &= (etsy['reviews_count'] >= min_reviews).to_numpy()
+
+    boards = []
+    for name in masks.columns:
+        member = masks[name].to_numpy() & eligible
+        winners = ranking[member].nlargest(k, keys, keep='first').index[:k]
+        board = etsy.loc[winners, list(columns)]
+        board.insert(0, 'rank', range(1, len(board) + 1))
+        board.insert(0, 'segment', name)
+        boards.append(board)
+    if not boards:
+        return pd.DataFrame(columns=['segment', 'rank', *columns])
+    return pd.concat(boards)
@@ -0,0 +1,107 @@
+"""Confidence-adjusted rating scores for listings and brands."""
+
+import numpy as np
+import pandas as pd
+
+RATING_RANGE = (1.0, 5.0)
+# the only columns brand_scores reads
+SCORE_COLUMNS = ('brand', 'average_rating', 'reviews_count')
+
+
+def _arrays(rating, reviews):
+    rating = np.asarray(rating, dtype=np.float64)
+    reviews = np.asarray(reviews, dtype=np.float64)
+    # a missing rating carries no evidence, whatever the review count says
+    reviews = np.where(np.isnan(rating) | np.isnan(reviews), 0.0, reviews)
+    return np.nan_to_num(rating), reviews
+
+
+def rating_prior(rating, reviews):
+    """Return the default ``(prior_mean, prior_weight)`` for ``bayesian_rating``.
+
+    The prior mean is the review-weighted mean rating and the prior weight
+    is the median review count of listings that have any reviews.
+    """
+    rating, reviews = _arrays(rating, reviews)
+    reviewed = reviews > 0
+    if not reviewed.any():
+        return float(np.mean(RATING_RANGE)), 1.0
+    prior_mean = float((rating * reviews).sum() / reviews.sum())
+    prior_weight = float(np.median(reviews[reviewed]))
+    return prior_mean, prior_weight
+
+
+def bayesian_rating(rating, reviews, prior_mean=None, prior_weight=None):
+    """Shrink each average rating towards ``prior_mean`` by its review count.
+
+    ``score = (prior_weight * prior_mean + reviews * rating) / (prior_weight + reviews)``,
+    so a 5.0 from one review scores close to the catalogue mean while a 4.9
+    from hundreds of reviews keeps most of its value.
+    """
+    default_mean, default_weight = rating_prior(rating, reviews)
+    prior_mean = default_mean if prior_mean is None else prior_mean
+    prior_weight = default_weight if prior_weight is None else prior_weight
+    rating, reviews = _arrays(rating, reviews)
+    return (prior_weight * prior_mean + reviews * rating) / (prior_weight + reviews)
+
+
+def wilson_lower_bound(rating, reviews, z=1.96):
+    """Lower bound of the Wilson interval of the share of 'positive' stars.
+
+    The average rating is mapped onto ``RATING_RANGE`` as a positive share;
+    listings without reviews score 0.
+    """
+    rating, reviews = _arrays(rating, reviews)
+    low, high = RATING_RANGE
+    p = np.clip((rating - low) / (high - low), 0.0, 1.0)
+    n = np.maximum(reviews, 1.0)
+    z2 = z * z
+    bound = (p + z2 / (2 * n) - z * np.sqrt((p * (1 - p) + z2 / (4 * n)) / n)) / (1 + z2 / n)
+    return np.where(reviews > 0, bound, 0.0)
+
+
+SCORERS = {'bayesian': bayesian_rating, 'wilson': wilson_lower_bound}
+
+
+def rating_scores(rating, reviews, method='bayesian'):
+    """Return the float32 ``rating_score`` of every listing.
+
+    Unrated listings (no ``average_rating``) score NaN rather than the
+    prior, so rankings leave them out.
+    """
+    rating = np.asarray(rating, dtype=np.float64)
+    score = SCORERS[method](rating, reviews)
+    return np.where(np.isnan(rating), np.nan, score).astype(np.float32)
+
+
+def add_rating_scores(etsy, method='bayesian'):
+    """Return a copy of ``etsy`` with a ``rating_score`` column per listing (see ``rating_scores``)."""
+    etsy = etsy.copy()
+    etsy['rating_score'] = rating_scores(etsy['average_rating'].to_numpy(dtype=np.float64, na_value=np.nan),
+                                         etsy['reviews_count'].to_numpy(dtype=np.float64, na_value=np.nan),
+                                         method)
+    return etsy
+
+
+def brand_scores(etsy, method='bayesian'):
+    """Score every brand from the ratings and review counts of its listings.
+
+    A brand's rating is the review-weighted mean of its listings' ratings
+    and its evidence is their total review count; the table is sorted by
+    ``rating_score``, best first.
+    """
+    rating, reviews = _arrays(etsy['average_rating'], etsy['reviews_count'])
+    grouped = pd.DataFrame({
+        'brand': etsy['brand'].to_numpy(),
+        'weighted': rating * reviews,
+        'reviews_count': reviews,
+    }).groupby('brand', observed=True, sort=False).agg(
+        listings=('reviews_count', 'size'),
+        weighted=('weighted', 'sum'),
+        reviews_count=('reviews_count', 'sum'),
+    )
+    with np.errstate(invalid='ignore', divide='ignore'):
+        grouped['average_rating'] = grouped['weighted'] / grouped['reviews_count']
+    grouped = grouped.drop(columns='weighted')
+    grouped['rating_score'] = SCORERS[method](grouped['average_rating'], grouped['reviews_count'])
+    return grouped.sort_values('rating_score', ascending=False, kind='stable')
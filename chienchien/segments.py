@@ -0,0 +1,211 @@
+"""Declarative segment definitions and the engine that evaluates them."""
+
+import json
+from dataclasses import asdict, dataclass
+from typing import Optional
+
+import pandas as pd
+
+from .bitmaps import SegmentBitmaps
+from .instrument import NullTracer
+from .matcher import match_keywords
+from .ranking import top_k_segments
+from .stats import DESCRIBE_COLUMNS, describe_segments, segment_price_stats
+from .views import SegmentView
+
+
+@dataclass(frozen=True)
+class Segment:
+    """Rows whose ``column`` contains ``keyword`` (and ``sub_keyword``, if set)."""
+
+    name: str
+    keyword: str
+    sub_keyword: Optional[str] = None
+    column: str = 'description'
+
+    @property
+    def parent(self):
+        """The ``(column, keyword)`` mask this segment narrows down."""
+        return (self.column, self.keyword)
+
+
+AREAS_OF_INTEREST = (
+    Segment('gift', 'Gift'),
+    Segment('gift_painting', 'Gift', 'Painting'),
+    Segment('gift_paper', 'Gift', 'Paper'),
+    Segment('decor', 'Decor'),
+    Segment('decor_painting', 'Decor', 'Painting'),
+    Segment('decor_paper', 'Decor', 'Paper'),
+    Segment('chinese', 'Chinese'),
+    Segment('japanese', 'Japanese'),
+    Segment('custom', 'Custom'),
+    Segment('custom_painting', 'Custom', 'Painting'),
+    Segment('custom_paper', 'Custom', 'Paper'),
+    Segment('color_print', 'color print'),
+    Segment('handmade_paper', 'handmade paper', column='product_details'),
+)
+
+
+def leaf_segments(segments):
+    """Return the segments that no other segment narrows down.
+
+    For the Areas of Interest these are the ten segments whose price means
+    make up the notebook's ``Total_pricemean`` ('gift', 'decor' and
+    'custom' are only parents of their Painting/Paper sub-categories).
+    """
+    parents = {segment.parent for segment in segments if segment.sub_keyword is not None}
+    return tuple(
+        segment for segment in segments
+        if segment.sub_keyword is not None or segment.parent not in parents
+    )
+
+
+def load_segments(path):
+    """Read segment definitions from a JSON list of ``Segment`` fields."""
+    with open(path) as f:
+        return tuple(Segment(**spec) for spec in json.load(f))
+
+
+def dump_segments(segments, path):
+    """Write segment definitions in the format ``load_segments`` reads."""
+    with open(path, 'w') as f:
+        json.dump([asdict(segment) for segment in segments], f, indent=2)
+
+
+@dataclass
+class SegmentResult:
+    """Everything the notebook shows for one segment."""
+
+    name: str
+    frame: pd.DataFrame
+    non_null: pd.Series
+    describe: pd.DataFrame
+    category: list
+    sort: pd.DataFrame
+    brand: list
+
+
+@dataclass
+class SegmentTables:
+    """The per-segment tables of a whole analysis run, whatever computed them."""
+
+    describe: pd.DataFrame
+    category: dict
+    brand: dict
+    leaderboard: pd.DataFrame
+
+    def price_stats(self):
+        """Count, mean, std, min and max of price for every segment."""
+        stats = self.describe.xs('price', level='column')
+        return stats[['count', 'mean', 'std', 'min', 'max']]
+
+
+class SegmentEngine:
+    """Evaluate many segments over one frame, sharing all intermediate masks.
+
+    Each search column is scanned once for every keyword used by any
+    segment, each ``(column, keyword)`` parent mask is built once and reused
+    by all segments that narrow it, and per-segment outputs are computed
+    from those masks. With ``normalized=True`` keywords match regardless
+    of case, accents and whitespace (see ``match_keywords``).
+    """
+
+    def __init__(self, etsy, segments=AREAS_OF_INTEREST, normalized=False):
+        self.etsy = etsy
+        self.segments = tuple(segments)
+        self.normalized = normalized
+        self._masks = None
+
+    def keyword_hits(self):
+        """Return the rows x ``(column, keyword)`` boolean matrix."""
+        keywords_by_column = {}
+        for segment in self.segments:
+            keywords = keywords_by_column.setdefault(segment.column, [])
+            keywords.append(segment.keyword)
+            if segment.sub_keyword is not None:
+                keywords.append(segment.sub_keyword)
+        return match_keywords(self.etsy, keywords_by_column, self.normalized)
+
+    def masks(self):
+        """Return the rows x segments boolean membership matrix."""
+        if self._masks is None:
+            hits = self.keyword_hits()
+            masks = {}
+            for segment in self.segments:
+                mask = hits[segment.parent]
+                if segment.sub_keyword is not None:
+                    mask = mask & hits[(segment.column, segment.sub_keyword)]
+                masks[segment.name] = mask.to_numpy()
+            self._masks = pd.DataFrame(masks, index=self.etsy.index)
+        return self._masks
+
+    def view(self, name):
+        """Return the rows of segment ``name`` as a ``SegmentView`` of the base frame."""
+        return SegmentView.from_mask(self.etsy, self.masks()[name], name)
+
+    def views(self):
+        """Return ``{segment name: SegmentView}`` for every segment."""
+        return {segment.name: self.view(segment.name) for segment in self.segments}
+
+    def bitmaps(self, backend=None):
+        """Return the membership of every segment as ``SegmentBitmaps``."""
+        return SegmentBitmaps.from_masks(self.masks(), backend)
+
+    def price_stats(self, column='price'):
+        """Return count/mean/std/min/max of ``column`` for every segment."""
+        return segment_price_stats(self.etsy, self.masks(), column)
+
+    def leaderboard(self, k=10, by=None, tie_breaker='reviews_count', min_reviews=0):
+        """Return the top-``k`` rows of every segment (see ``top_k_segments``)."""
+        return top_k_segments(self.etsy, self.masks(), k, by, tie_breaker, min_reviews)
+
+    def describe(self, columns=DESCRIBE_COLUMNS):
+        """Return the tidy ``(segment, column)`` describe table of every segment."""
+        return describe_segments(self.etsy, self.masks(), columns)
+
+    def result(self, name, describe=None):
+        """Compute the notebook outputs for the segment ``name``.
+
+        ``describe`` is the table from ``describe()``; pass it when building
+        many results so the statistics are aggregated only once.
+        """
+        if describe is None:
+            describe = self.describe()
+        frame = self.view(name).frame()
+        return SegmentResult(
+            name=name,
+            frame=frame,
+            non_null=frame.notna().sum(),
+            describe=describe.xs(name, level='segment').T.rename_axis(columns=None),
+            category=frame['category'].unique().tolist(),
+            sort=frame.sort_values(by=['average_rating'], ascending=False),
+            brand=frame['brand'].unique().tolist(),
+        )
+
+    def tables(self, k=10, by=None, tie_breaker='reviews_count', min_reviews=0, tracer=None):
+        """Return the ``SegmentTables`` of every segment.
+
+        Each step runs as a stage of ``tracer`` (an ``instrument.Tracer``)
+        when one is given.
+        """
+        tracer = tracer or NullTracer()
+        rows = len(self.etsy)
+        masks = tracer.call('segment_filter', self.masks, rows_in=rows)
+        describe = tracer.call('describe', self.describe, rows_in=rows)
+        with tracer.stage('uniques', rows) as record:
+            views = self.views()
+            category = {name: view.column('category').unique().tolist() for name, view in views.items()}
+            brand = {name: view.column('brand').unique().tolist() for name, view in views.items()}
+            record['rows_out'] = sum(map(len, brand.values()))
+        leaderboard = tracer.call('ranking', self.leaderboard, k, by, tie_breaker, min_reviews, rows_in=rows)
+        return SegmentTables(describe=describe, category=category, brand=brand, leaderboard=leaderboard)
+
+    def run(self):
+        """Return ``{segment name: SegmentResult}`` for every segment."""
+        describe = self.describe()
+        return {segment.name: self.result(segment.name, describe) for segment in self.segments}
+
+
+def segment_masks(etsy, segments=AREAS_OF_INTEREST, normalized=False):
+    """Return a rows x segments boolean DataFrame for ``segments``."""
+    return SegmentEngine(etsy, segments, normalized).masks()
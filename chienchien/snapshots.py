@@ -0,0 +1,167 @@
+"""Append-only, date-partitioned store of listing price and rating history."""
+
+import uuid
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from .cleaning import clean_etsy
+from .incremental import INCREMENTAL_COLUMNS, prepare_scrape
+from .loader import load_etsy
+from .segments import AREAS_OF_INTEREST, SegmentEngine, dump_segments, load_segments
+
+# prices are kept in cents and ratings in tenths of a star, as integers, so
+# Parquet can delta-encode them
+PRICE_SCALE = 100
+RATING_SCALE = 10
+DELTA_COLUMNS = ('listing_key', 'price', 'average_rating', 'reviews_count')
+SEGMENT_PREFIX = 'in_'
+ROW_GROUP_SIZE = 64_000
+
+
+class SnapshotStore:
+    """Per-listing price, rating and review history across many scrapes.
+
+    Each ``append`` writes the scrape's rows under
+    ``scrape_date=YYYY-MM-DD/`` as a new Parquet part, sorted by brand so
+    row-group statistics let a brand query skip most of every file. Prices,
+    ratings and review counts are stored as delta-encoded integers and
+    each segment's membership as a boolean column, so the store stays a
+    small fraction of the JSON dumps it was built from and answers range
+    queries per brand, segment or listing without touching any dump.
+    """
+
+    def __init__(self, root, segments=AREAS_OF_INTEREST, normalized=False):
+        self.root = Path(root)
+        spec = self.root / 'segments.json'
+        self.segments = load_segments(spec) if spec.exists() else tuple(segments)
+        self.normalized = normalized
+
+    def append(self, scrape):
+        """Add a scrape (a path or a loaded frame with ``scraped_at``); return the rows written."""
+        if not isinstance(scrape, pd.DataFrame):
+            scrape = load_etsy(scrape, INCREMENTAL_COLUMNS)
+        scrape = prepare_scrape(scrape)
+        masks = SegmentEngine(clean_etsy(scrape, normalized=self.normalized), self.segments, self.normalized).masks()
+
+        rating = scrape['average_rating'].to_numpy(dtype=np.float64)
+        rows = pd.DataFrame({
+            'listing_key': scrape['listing_key'].to_numpy().view(np.int64),
+            'brand': scrape['brand'].astype(str),
+            'category': scrape['category'].astype(str),
+            'scraped_at': scrape['scraped_at'],
+            'price': pd.array(np.round(scrape['price'].to_numpy(dtype=np.float64) * PRICE_SCALE), dtype='Int64'),
+            'average_rating': pd.array(np.round(rating * RATING_SCALE), dtype='Int32'),
+            'reviews_count': pd.array(scrape['reviews_count'].to_numpy(dtype=np.float64), dtype='Int32'),
+        })
+        for name in masks.columns:
+            rows[SEGMENT_PREFIX + name] = masks[name].to_numpy()
+
+        self.root.mkdir(parents=True, exist_ok=True)
+        if not (self.root / 'segments.json').exists():
+            dump_segments(self.segments, self.root / 'segments.json')
+        for date, part in rows.groupby(rows['scraped_at'].dt.strftime('%Y-%m-%d'), sort=True):
+            self._write_part(date, part.sort_values(['brand', 'listing_key'], kind='stable'))
+        return len(rows)
+
+    def _write_part(self, date, part):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        directory = self.root / f'scrape_date={date}'
+        directory.mkdir(exist_ok=True)
+        path = directory / f'part-{uuid.uuid4().hex}.parquet'
+        tmp = path.with_name(path.name + '.tmp')
+        pq.write_table(
+            pa.Table.from_pandas(part, preserve_index=False),
+            tmp,
+            row_group_size=ROW_GROUP_SIZE,
+            use_dictionary=['brand', 'category'],
+            column_encoding={column: 'DELTA_BINARY_PACKED' for column in DELTA_COLUMNS},
+            compression='zstd',
+        )
+        tmp.replace(path)
+
+    def dates(self):
+        """Return the stored scrape dates, oldest first."""
+        return sorted(path.name.split('=', 1)[1] for path in self.root.glob('scrape_date=*'))
+
+    def history(self, brand=None, segment=None, listing=None, start=None, end=None, columns=None):
+        """Return the stored rows matching every given filter, oldest first.
+
+        ``brand`` and ``listing`` (a listing key) may be single values or
+        lists; ``start`` and ``end`` are inclusive ``YYYY-MM-DD`` dates and
+        prune whole partitions. Prices and ratings come back as floats; a
+        range without any scrape gives an empty frame.
+        """
+        import pyarrow as pa
+        import pyarrow.dataset as ds
+
+        if not self.dates():
+            raise FileNotFoundError(f'no snapshots in {self.root}')
+        if columns is not None:
+            columns = list(dict.fromkeys(['scrape_date', 'listing_key', 'scraped_at', *columns]))
+        # partitions outside [start, end] are never opened
+        files = [
+            str(path) for date in self.dates()
+            if (start is None or date >= str(start)) and (end is None or date <= str(end))
+            for path in sorted((self.root / f'scrape_date={date}').glob('*.parquet'))
+        ]
+        if not files:
+            return self._empty_history(columns)
+        dataset = ds.dataset(
+            files, format='parquet', partition_base_dir=str(self.root),
+            partitioning=ds.partitioning(pa.schema([('scrape_date', pa.string())]), flavor='hive'),
+        )
+        conditions = []
+        if brand is not None:
+            conditions.append(ds.field('brand').isin(np.atleast_1d(brand).astype(str).tolist()))
+        if listing is not None:
+            keys = np.atleast_1d(np.asarray(listing, dtype=np.uint64)).view(np.int64)
+            conditions.append(ds.field('listing_key').isin(keys.tolist()))
+        if segment is not None:
+            conditions.append(ds.field(SEGMENT_PREFIX + segment))
+        condition = None
+        for part in conditions:
+            condition = part if condition is None else condition & part
+
+        frame = dataset.to_table(columns=columns, filter=condition).to_pandas()
+        frame['listing_key'] = frame['listing_key'].to_numpy().view(np.uint64)
+        for column, scale in (('price', PRICE_SCALE), ('average_rating', RATING_SCALE)):
+            if column in frame:
+                frame[column] = frame[column].astype('float64') / scale
+        return frame.sort_values(['scraped_at', 'listing_key'], kind='stable').reset_index(drop=True)
+
+    def _empty_history(self, columns):
+        frame = pd.DataFrame({
+            'listing_key': pd.Series(dtype=np.uint64),
+            'brand': pd.Series(dtype=str),
+            'category': pd.Series(dtype=str),
+            'scraped_at': pd.Series(dtype='datetime64[us]'),
+            'price': pd.Series(dtype=np.float64),
+            'average_rating': pd.Series(dtype=np.float64),
+            'reviews_count': pd.Series(dtype='Int32'),
+            **{SEGMENT_PREFIX + segment.name: pd.Series(dtype=bool) for segment in self.segments},
+            'scrape_date': pd.Series(dtype=str),
+        })
+        return frame if columns is None else frame[columns]
+
+    def trend(self, brand=None, segment=None, start=None, end=None):
+        """Return per-scrape-date price, rating and review aggregates.
+
+        With ``brand`` or ``segment`` only their listings are aggregated;
+        the table has one row per stored date in range.
+        """
+        frame = self.history(brand, segment, start=start, end=end,
+                             columns=['brand', 'price', 'average_rating', 'reviews_count'])
+        return frame.groupby('scrape_date').agg(
+            listings=('listing_key', 'size'),
+            brands=('brand', 'nunique'),
+            price_mean=('price', 'mean'),
+            price_median=('price', 'median'),
+            price_min=('price', 'min'),
+            price_max=('price', 'max'),
+            average_rating=('average_rating', 'mean'),
+            reviews_count=('reviews_count', 'sum'),
+        )
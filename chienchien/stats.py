@@ -0,0 +1,89 @@
+"""Vectorized statistics over the segment membership matrix."""
+
+import numpy as np
+import pandas as pd
+
+DESCRIBE_COLUMNS = ('price', 'average_rating', 'reviews_count')
+DESCRIBE_STATS = ('count', 'mean', 'std', 'min', '25%', '50%', '75%', 'max')
+_QUANTILES = (0.0, 0.25, 0.5, 0.75, 1.0)
+
+
+def _describe_column(values, member):
+    """``describe()`` of ``values`` within every column of ``member``.
+
+    Each segment gathers only its own members' values, so its order
+    statistics and sums cost its member count and no rows x segments
+    temporaries are built. When the segments hold more rows in total than
+    the column, the column is argsorted once and every segment sorts its
+    members' ranks (integers) instead of their values.
+    """
+    valid = ~np.isnan(values)
+    ordered = rank = None
+    if np.count_nonzero(member) > len(values):
+        rows = np.flatnonzero(valid)
+        order = np.argsort(values[rows])
+        ordered = values[rows][order]
+        # rank[i] is the position of row i among the sorted valid values
+        rank = np.zeros(len(values), dtype=np.int64)
+        rank[rows[order]] = np.arange(len(order))
+
+    n_segments = member.shape[1]
+    out = np.full((len(DESCRIBE_STATS), n_segments), np.nan)
+    quantiles = np.asarray(_QUANTILES)
+    for j in range(n_segments):
+        members = np.flatnonzero(member[:, j] & valid)
+        count = len(members)
+        out[0, j] = count
+        if not count:
+            continue
+        segment = np.sort(values[members]) if rank is None else ordered[np.sort(rank[members])]
+        out[1, j] = segment.mean()
+        if count > 1:
+            out[2, j] = segment.std(ddof=1)
+        # linear interpolation between order statistics, as pandas does
+        h = (count - 1) * quantiles
+        lo, hi = np.floor(h).astype(np.int64), np.ceil(h).astype(np.int64)
+        out[3:, j] = segment[lo] + (h - lo) * (segment[hi] - segment[lo])
+    return out
+
+
+def describe_segments(etsy, masks, columns=DESCRIBE_COLUMNS):
+    """Return ``describe()`` statistics of ``columns`` for every segment.
+
+    ``masks`` is the rows x segments boolean matrix from
+    ``SegmentEngine.masks()``. The result is a tidy table indexed by
+    ``(segment, column)`` with the count, mean, std, min, quartiles and max
+    ``describe()`` would report; missing values are skipped and ``std``
+    uses ``ddof=1``.
+    """
+    member = masks.to_numpy(dtype=bool)
+    blocks = []
+    for column in columns:
+        values = etsy[column].to_numpy(dtype=np.float64)
+        stats = pd.DataFrame(_describe_column(values, member).T, index=masks.columns, columns=DESCRIBE_STATS)
+        stats['column'] = column
+        blocks.append(stats)
+    table = pd.concat(blocks).rename_axis('segment').set_index('column', append=True)
+    order = pd.MultiIndex.from_product([masks.columns, list(columns)], names=['segment', 'column'])
+    return table.reindex(order)
+
+
+def segment_price_stats(etsy, masks, column='price'):
+    """Return count, mean, std, min and max of ``column`` for every segment."""
+    stats = describe_segments(etsy, masks, [column]).xs(column, level='column')
+    return stats[['count', 'mean', 'std', 'min', 'max']]
+
+
+def combined_price_mean(stats, segments=None, weighted=False):
+    """Average the per-segment means in ``stats`` into one overall mean.
+
+    By default every segment counts once, like the notebook's
+    ``Total_pricemean``; with ``weighted=True`` each segment mean is
+    weighted by its listing count.
+    """
+    if segments is not None:
+        stats = stats.loc[list(segments)]
+    stats = stats[stats['count'] > 0]
+    if weighted:
+        return float((stats['mean'] * stats['count']).sum() / stats['count'].sum())
+    return float(stats['mean'].mean())
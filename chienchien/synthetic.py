@@ -0,0 +1,90 @@
+"""Synthetic Etsy catalogues with the scrape's schema, for benchmarking."""
+
+import json
+
+import numpy as np
+import pandas as pd
+
+# share of listings whose text contains each Areas of Interest keyword,
+# roughly as often as they occur in the 2021 scrape
+DESCRIPTION_KEYWORDS = {
+    'Gift': 0.02,
+    'Decor': 0.009,
+    'Painting': 0.03,
+    'Paper': 0.03,
+    'Chinese': 0.002,
+    'Japanese': 0.003,
+    'Custom': 0.05,
+    'color print': 0.001,
+}
+PRODUCT_DETAILS_KEYWORDS = {'handmade paper': 0.0005}
+
+FILLER_WORDS = (
+    'art print wall personalized vintage handmade ring necklace sticker card '
+    'wedding birthday dog cat portrait digital download watercolor frame mug '
+    'shirt earrings silver gold linen cotton set of two large small gift-ready'
+).split()
+CATEGORIES = (
+    'Art & Collectibles', 'Home & Living', 'Jewelry', 'Paper & Party Supplies',
+    'Clothing', 'Weddings', 'Pet Supplies', 'Craft Supplies & Tools', 'Accessories',
+)
+
+
+def _texts(rng, n, n_words, keywords):
+    words = rng.choice(FILLER_WORDS, size=(n, n_words))
+    texts = [' '.join(row) for row in words]
+    for keyword, share in keywords.items():
+        for row in np.flatnonzero(rng.random(n) < share):
+            texts[row] = f'{texts[row]} {keyword}'
+    return texts
+
+
+def generate_catalogue(n, seed=0, n_brands=None, start=0):
+    """Return ``n`` synthetic listings with every column of ``etsy.json``.
+
+    ``start`` offsets the generated brand/listing numbering so successive
+    chunks of one catalogue do not repeat each other.
+    """
+    rng = np.random.default_rng((seed, start))
+    n_brands = n_brands or max(10, n // 20)
+    reviews = rng.zipf(1.6, n).clip(max=50_000) - 1
+    rating = np.round(rng.beta(8, 1.2, n) * 4 + 1, 1)
+    rating[reviews == 0] = np.nan
+    details = _texts(rng, n, 6, PRODUCT_DETAILS_KEYWORDS)
+    return pd.DataFrame({
+        'description': _texts(rng, n, 12, DESCRIPTION_KEYWORDS),
+        'product_details': ['\n\n\n\n\n\n'.join(text.split(' ', 2)) for text in details],
+        'brand': [f'Shop{b}' for b in rng.zipf(1.3, n) % n_brands],
+        'price': np.round(rng.lognormal(3.5, 0.9, n), 2),
+        'category': rng.choice(CATEGORIES, n),
+        'average_rating': rating,
+        'reviews_count': reviews,
+        'images': [[f'https://i.etsystatic.com/{start + i}/{j}.jpg' for j in range(4)] for i in range(n)],
+        'availability': rng.random(n) < 0.97,
+        'scraped_at': '2021-06-01T00:00:00',
+    })
+
+
+def write_catalogue(path, n, seed=0, lines=False, chunksize=100_000):
+    """Write an ``n``-row synthetic catalogue as a JSON array (or JSON Lines).
+
+    Rows are generated and written ``chunksize`` at a time, so catalogues
+    larger than memory can be produced.
+    """
+    with open(path, 'w', encoding='utf-8') as f:
+        if not lines:
+            f.write('[')
+        first = True
+        for start in range(0, n, chunksize):
+            chunk = generate_catalogue(min(chunksize, n - start), seed, start=start)
+            for record in chunk.to_dict(orient='records'):
+                if record['average_rating'] != record['average_rating']:
+                    record['average_rating'] = None
+                text = json.dumps(record, default=lambda v: v.item())
+                if lines:
+                    f.write(text + '\n')
+                else:
+                    f.write(text if first else ',\n' + text)
+                first = False
+        if not lines:
+            f.write(']')
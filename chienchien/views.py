@@ -0,0 +1,73 @@
+"""Segments as row-index views over the base frame."""
+
+import numpy as np
+
+from .cleaning import NORMALIZED_SUFFIX
+from .matcher import match_keywords
+
+
+class SegmentView:
+    """The rows of ``base`` at the positions ``rows``, without copying them.
+
+    A view costs one index array; a step gathers only the columns it reads
+    with ``column()`` or ``frame(columns)``, and sub-segments are narrowed
+    views of the same base rather than copies of a copy.
+    """
+
+    __slots__ = ('base', 'rows', 'name')
+
+    def __init__(self, base, rows, name=None):
+        self.base = base
+        self.rows = np.asarray(rows, dtype=np.int64)
+        self.name = name
+
+    @classmethod
+    def from_mask(cls, base, mask, name=None):
+        """View the rows of ``base`` where the boolean ``mask`` is set."""
+        return cls(base, np.flatnonzero(np.asarray(mask, dtype=bool)), name)
+
+    def __len__(self):
+        return len(self.rows)
+
+    def __repr__(self):
+        return f'<SegmentView {self.name!r}: {len(self)} of {len(self.base)} rows>'
+
+    @property
+    def index(self):
+        """The base-frame labels of the viewed rows."""
+        return self.base.index[self.rows]
+
+    @property
+    def nbytes(self):
+        return self.rows.nbytes
+
+    def column(self, column):
+        """Gather one column of the viewed rows (a Series keeping the base labels)."""
+        return self.base[column].iloc[self.rows]
+
+    def frame(self, columns=None):
+        """Gather ``columns`` (default: all) of the viewed rows into a DataFrame."""
+        if columns is None:
+            return self.base.iloc[self.rows]
+        return self.base.iloc[self.rows, self.base.columns.get_indexer(list(columns))]
+
+    def narrow(self, mask, name=None):
+        """Return the view of the rows where ``mask`` (aligned to this view) is set."""
+        return type(self)(self.base, self.rows[np.asarray(mask, dtype=bool)], name or self.name)
+
+    def where(self, column, keyword, normalized=False, name=None):
+        """Narrow to the rows whose ``column`` contains ``keyword``; only those rows are scanned."""
+        shadow = column + NORMALIZED_SUFFIX
+        columns = [shadow] if normalized and shadow in self.base else [column]
+        hits = match_keywords(self.frame(columns), {column: [keyword]}, normalized)
+        return self.narrow(hits.iloc[:, 0].to_numpy(), name)
+
+    def __and__(self, other):
+        if other.base is not self.base:
+            raise ValueError('views of different frames')
+        return type(self)(self.base, np.intersect1d(self.rows, other.rows, assume_unique=True))
+
+    def __or__(self, other):
+        if other.base is not self.base:
+            raise ValueError('views of different frames')
+        return type(self)(self.base, np.union1d(self.rows, other.rows))
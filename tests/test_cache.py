@@ -0,0 +1,89 @@
+import os
+
+import pytest
+
+from chienchien import cache
+from chienchien.cache import load_cached
+from chienchien.cleaning import NORMALIZED_SUFFIX
+from chienchien.synthetic import write_catalogue
+
+pytest.importorskip('pyarrow')
+
+
+@pytest.fixture
+def builds(monkeypatch):
+    """Count the cache misses, i.e. the times the frame is cleaned from the JSON."""
+    calls = []
+    clean_etsy = cache.clean_etsy
+
+    def counting(*args, **kwargs):
+        calls.append(kwargs.get('normalized', False))
+        return clean_etsy(*args, **kwargs)
+
+    monkeypatch.setattr(cache, 'clean_etsy', counting)
+    return calls
+
+
+@pytest.fixture
+def path(tmp_path):
+    path = tmp_path / 'etsy.json'
+    write_catalogue(path, 300, seed=4)
+    return path
+
+
+def test_hit_after_build(path, tmp_path, builds):
+    first = load_cached(path, tmp_path / 'cache')
+    second = load_cached(path, tmp_path / 'cache')
+    assert len(builds) == 1
+    assert second.equals(first)
+
+
+def test_touched_but_unchanged_source_is_rehashed_once(path, tmp_path, builds, monkeypatch):
+    load_cached(path, tmp_path / 'cache')
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    hashes = []
+    file_sha256 = cache.file_sha256
+    monkeypatch.setattr(cache, 'file_sha256', lambda p: hashes.append(p) or file_sha256(p))
+    load_cached(path, tmp_path / 'cache')
+    load_cached(path, tmp_path / 'cache')
+    assert len(builds) == 1
+    # the new mtime was recorded, so only the first load hashed the file
+    assert len(hashes) == 1
+
+
+def test_changed_size_rebuilds(path, tmp_path, builds):
+    load_cached(path, tmp_path / 'cache')
+    write_catalogue(path, 200, seed=4)
+    assert len(load_cached(path, tmp_path / 'cache')) == 200
+    assert len(builds) == 2
+
+
+def test_cleaning_version_change_rebuilds(path, tmp_path, builds, monkeypatch):
+    load_cached(path, tmp_path / 'cache')
+    monkeypatch.setattr(cache, 'CLEANING_VERSION', cache.CLEANING_VERSION + 1)
+    load_cached(path, tmp_path / 'cache')
+    load_cached(path, tmp_path / 'cache')
+    assert len(builds) == 2
+
+
+def test_normalized_request_rebuilds_a_plain_cache(path, tmp_path, builds):
+    plain = load_cached(path, tmp_path / 'cache')
+    assert not any(column.endswith(NORMALIZED_SUFFIX) for column in plain)
+    normalized = load_cached(path, tmp_path / 'cache', normalized=True)
+    assert 'description' + NORMALIZED_SUFFIX in normalized
+    # a normalized cache serves plain requests too
+    load_cached(path, tmp_path / 'cache')
+    assert builds == [False, True]
+
+
+def test_same_named_sources_do_not_share_a_cache(tmp_path, builds):
+    a, b = tmp_path / 'a' / 'etsy.json', tmp_path / 'b' / 'etsy.json'
+    a.parent.mkdir()
+    b.parent.mkdir()
+    write_catalogue(a, 100, seed=5)
+    write_catalogue(b, 150, seed=6)
+    for _ in range(2):
+        assert len(load_cached(a, tmp_path / 'cache')) == 100
+        assert len(load_cached(b, tmp_path / 'cache')) == 150
+    assert len(builds) == 2
@@ -0,0 +1,22 @@
+import pandas as pd
+import pytest
+
+from chienchien import ANALYSIS_COLUMNS, SegmentEngine, clean_etsy, load_etsy, run_segments_chunked
+from chienchien.synthetic import write_catalogue
+
+
+@pytest.fixture(scope='module')
+def path(tmp_path_factory):
+    path = tmp_path_factory.mktemp('scrape') / 'etsy.json'
+    write_catalogue(path, 3000, seed=5)
+    return path
+
+
+def test_default_ranking_matches_segment_engine(path):
+    engine = SegmentEngine(clean_etsy(load_etsy(path, ANALYSIS_COLUMNS)))
+    expected = engine.tables(k=5, min_reviews=1).leaderboard
+    leaderboard = run_segments_chunked(path, chunksize=700, k=5, min_reviews=1).leaderboard
+    pd.testing.assert_frame_equal(leaderboard.reset_index(drop=True), expected.reset_index(drop=True),
+                                  check_dtype=False)
+    explicit = run_segments_chunked(path, chunksize=700, k=5, by='average_rating', min_reviews=1).leaderboard
+    pd.testing.assert_frame_equal(leaderboard, explicit)
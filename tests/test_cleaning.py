@@ -0,0 +1,31 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from chienchien.cleaning import ARROW_NORMALIZERS, MATCH_NORMALIZERS, clean_text, normalize_text, replace_separators
+
+pytest.importorskip('pyarrow')
+
+
+@pytest.mark.parametrize('normalizers', [(replace_separators,), MATCH_NORMALIZERS])
+@pytest.mark.parametrize('dtype', [None, object])
+def test_arrow_engine_matches_python_on_any_index(normalizers, dtype):
+    texts = pd.Series(['Gift\n\n\n\n\n\nPAPER', np.nan, 'Café  «déco»', '', 'के लिए', 'Ｆｕｌｌ\u00a0width\u2003ﬁ'],
+                      index=[700, 701, 3, 702, 5, 6], dtype=dtype)
+    arrow = clean_text(texts, normalizers, engine='arrow')
+    python = clean_text(texts, normalizers, engine='process')
+    assert arrow.index.equals(texts.index)
+    assert arrow.isna().tolist() == texts.isna().tolist()
+    assert arrow.dropna().tolist() == python.dropna().tolist()
+
+
+@pytest.mark.parametrize('normalize', ARROW_NORMALIZERS, ids=lambda n: n.__name__)
+def test_each_arrow_kernel_matches_its_normalizer(normalize):
+    texts = pd.Series(['के लिए', 'Crème  Brûlée', 'ǅemal\u0301', 'Ｆｕｌｌ\u00a0width\u2003ﬁ', 'a\n\n\n\n\n\nb'])
+    arrow = clean_text(texts, (normalize,), engine='arrow')
+    assert arrow.tolist() == [normalize(text) for text in texts]
+
+
+def test_keywords_normalize_like_shadow_columns():
+    texts = pd.Series(['Hand-made लिए ÉCRU', 'के लिए'])
+    assert clean_text(texts, MATCH_NORMALIZERS, engine='arrow').tolist() == [normalize_text(t) for t in texts]
@@ -0,0 +1,29 @@
+import pandas as pd
+import pytest
+
+from chienchien.cli import main
+from chienchien.synthetic import write_catalogue
+
+
+@pytest.fixture(scope='module')
+def path(tmp_path_factory):
+    path = tmp_path_factory.mktemp('scrape') / 'etsy.json'
+    write_catalogue(path, 2000, seed=9)
+    return path
+
+
+def _run(path, out, *options):
+    assert main([str(path), '--out', str(out), '--no-charts', '--cache-dir', str(out.parent / 'cache'), *options]) == 0
+    return {name: pd.read_csv(out / name, index_col=0) for name in ('describe.csv', 'leaderboard.csv')}
+
+
+@pytest.mark.parametrize('backend', ['pandas', 'chunked', 'polars'])
+def test_backend_tables_match_the_engine(path, tmp_path, backend):
+    if backend == 'polars':
+        pytest.importorskip('polars')
+    # the chunked backend cannot compute rating_score, so both rank by average_rating
+    options = ['--rank-by', 'average_rating'] if backend == 'chunked' else []
+    expected = _run(path, tmp_path / 'engine', *options)
+    tables = _run(path, tmp_path / backend, '--backend', backend, *options)
+    pd.testing.assert_frame_equal(tables['describe.csv'], expected['describe.csv'], check_exact=False, rtol=1e-12)
+    pd.testing.assert_frame_equal(tables['leaderboard.csv'], expected['leaderboard.csv'])
@@ -0,0 +1,66 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from chienchien import BrandRollup, IncrementalCatalogue, InvertedIndex, SegmentEngine, clean_etsy, describe_segments
+from chienchien.incremental import INCREMENTAL_COLUMNS, MAX_DEAD_RATIO, prepare_scrape
+from chienchien.synthetic import generate_catalogue
+
+
+def _scrape(n, seed, start=0, date='2021-06-01'):
+    scrape = generate_catalogue(n, seed=seed, start=start)[list(INCREMENTAL_COLUMNS)]
+    scrape['scraped_at'] = f'{date}T00:00:00'
+    return scrape
+
+
+@pytest.fixture
+def scrapes():
+    rng = np.random.default_rng(21)
+    base = _scrape(800, seed=1)
+    second = base.copy()
+    second['scraped_at'] = '2021-06-08T00:00:00'
+    # value changes and text rewrites (identity is brand + description)
+    changed = rng.choice(len(second), 60, replace=False)
+    second.loc[changed, 'price'] = second.loc[changed, 'price'] + 1.0
+    second.loc[changed[:20], 'average_rating'] = np.nan
+    rewritten = rng.choice(len(second), 40, replace=False)
+    second.loc[rewritten, 'product_details'] = 'gift\n\n\n\n\n\nhandmade paper'
+    # removals past MAX_DEAD_RATIO force a compaction, then new listings
+    removed = rng.random(len(second)) < MAX_DEAD_RATIO + 0.1
+    second = pd.concat([second[~removed], _scrape(120, seed=2, start=5000, date='2021-06-08')], ignore_index=True)
+    # an older partial scrape of some current listings must change nothing
+    stale = second.sample(50, random_state=3).copy()
+    stale['scraped_at'] = '2021-05-01T00:00:00'
+    stale['price'] = 0.01
+    return base, second, stale
+
+
+def test_ingest_matches_a_fresh_build(scrapes):
+    base, second, stale = scrapes
+    catalogue = IncrementalCatalogue(index_columns=['description'])
+    catalogue.ingest(base)
+    delta = catalogue.ingest(second)
+    assert len(delta.added) == 120 and len(delta.changed) and len(delta.rewritten) and len(delta.removed)
+    assert catalogue.live.all()  # compacted
+    assert not len(catalogue.ingest(stale, full=False))
+
+    fresh = clean_etsy(prepare_scrape(second))
+    masks = SegmentEngine(fresh).masks()
+    live = catalogue.frame()
+    assert sorted(live['listing_key']) == sorted(fresh['listing_key'])
+
+    pd.testing.assert_frame_equal(catalogue.describe, describe_segments(fresh, masks), check_exact=False, rtol=1e-9)
+
+    rollup = catalogue.rollup.to_frame().sort_index()
+    expected = BrandRollup.build(fresh, masks).to_frame().sort_index()
+    pd.testing.assert_frame_equal(rollup, expected, check_exact=False, rtol=1e-9)
+
+    by_key = catalogue.segment_masks().set_axis(live['listing_key'].to_numpy())
+    pd.testing.assert_frame_equal(by_key.loc[fresh['listing_key'].to_numpy()],
+                                  masks.set_axis(fresh['listing_key'].to_numpy()))
+    assert not (live['price'] == 0.01).any()  # the stale prices
+
+    index = InvertedIndex.build(fresh, ['description'])
+    for expression in ('gift', 'gift AND paper', '"handmade paper" OR ink'):
+        keys = set(live['listing_key'].to_numpy()[catalogue.query(expression)])
+        assert keys == set(fresh['listing_key'].to_numpy()[index.mask(expression)])
@@ -0,0 +1,116 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from chienchien.index import InvertedIndex, load_index, tokenize
+from chienchien.synthetic import write_catalogue
+
+WORDS = ['gift', 'paper', 'handmade', 'painting', 'Chinese', 'ink', 'box', 'red']
+PHRASES = ['handmade paper', 'gift box', 'paper gift paper', 'red red', 'ink painting gift', 'missing word']
+
+
+@pytest.fixture(scope='module')
+def etsy():
+    rng = np.random.default_rng(11)
+    texts = [' '.join(rng.choice(WORDS, rng.integers(0, 40))) for _ in range(300)]
+    texts[3] = None
+    texts[4] = 'Handmade-PAPER, gift.'
+    return pd.DataFrame({'description': texts, 'product_details': texts[::-1]})
+
+
+def _reference(texts, term):
+    """Rows whose tokens contain ``term``'s tokens contiguously."""
+    needle = tokenize(term)
+    rows = []
+    for row, text in enumerate(texts):
+        tokens = tokenize(text) if isinstance(text, str) else []
+        if any(tokens[i:i + len(needle)] == needle for i in range(len(tokens) - len(needle) + 1)):
+            rows.append(row)
+    return np.asarray(rows, dtype=np.int64)
+
+
+def _assert_same(index, expected, column='description'):
+    for term in WORDS + PHRASES:
+        np.testing.assert_array_equal(index.lookup(term, column), expected.lookup(term, column), err_msg=term)
+
+
+@pytest.mark.parametrize('term', WORDS + PHRASES + ['HANDMADE Paper'])
+def test_lookup_matches_reference(etsy, term):
+    index = InvertedIndex.build(etsy)
+    for column in ('description', 'product_details'):
+        np.testing.assert_array_equal(index.lookup(term, column), _reference(etsy[column], term))
+
+
+def test_phrase_does_not_span_rows():
+    # 'paper' ends row 0 and 'gift' starts row 1: no 'paper gift' match
+    index = InvertedIndex.build(pd.DataFrame({'description': ['gift paper', 'gift paper']}), ['description'])
+    assert index.lookup('paper gift').tolist() == []
+    assert index.lookup('gift paper').tolist() == [0, 1]
+
+
+def test_query_precedence(etsy):
+    index = InvertedIndex.build(etsy)
+    texts = etsy['description']
+
+    def rows(term):
+        return set(_reference(texts, term).tolist())
+
+    gift, paper, ink, red = rows('gift'), rows('paper'), rows('ink'), rows('red')
+    assert set(index.query('gift OR paper AND ink').tolist()) == gift | (paper & ink)
+    assert set(index.query('(gift OR paper) AND ink').tolist()) == (gift | paper) & ink
+    assert set(index.query('gift paper OR red').tolist()) == (gift & paper) | red
+    assert set(index.query('"handmade paper" AND (ink OR red)').tolist()) == rows('handmade paper') & (ink | red)
+    assert index.mask('gift OR red').sum() == len(gift | red)
+
+
+@pytest.mark.parametrize('expression', ['(gift', 'gift)', '((gift OR paper)', 'gift OR', 'AND gift', '()', ''])
+def test_malformed_queries_raise(etsy, expression):
+    with pytest.raises(ValueError):
+        InvertedIndex.build(etsy).query(expression)
+
+
+def test_extend_matches_rebuild(etsy):
+    head, tail = etsy.iloc[:120], etsy.iloc[120:]
+    extended = InvertedIndex.build(head).extend(tail)
+    rebuilt = InvertedIndex.build(etsy)
+    assert extended.n_rows == rebuilt.n_rows
+    for column in ('description', 'product_details'):
+        _assert_same(extended, rebuilt, column)
+
+
+def test_compact_matches_rebuild(etsy):
+    keep = np.random.default_rng(12).random(len(etsy)) < 0.6
+    compacted = InvertedIndex.build(etsy).compact(keep)
+    rebuilt = InvertedIndex.build(etsy[keep].reset_index(drop=True))
+    assert compacted.n_rows == rebuilt.n_rows
+    _assert_same(compacted, rebuilt)
+    # compacting after extending: the state an incremental catalogue ends up in
+    extended = InvertedIndex.build(etsy.iloc[:150]).extend(etsy.iloc[150:]).compact(keep)
+    _assert_same(extended, rebuilt)
+
+
+def test_save_load_round_trip(etsy, tmp_path):
+    index = InvertedIndex.build(etsy)
+    index.save(tmp_path / 'index.npz', version='v1')
+    loaded, version = InvertedIndex.load(tmp_path / 'index.npz')
+    assert version == 'v1'
+    assert loaded.n_rows == index.n_rows and list(loaded.fields) == list(index.fields)
+    for column in ('description', 'product_details'):
+        _assert_same(loaded, index, column)
+
+
+def test_load_index_rebuilds_when_the_source_changes(tmp_path):
+    path = tmp_path / 'etsy.json'
+    cache_dir = tmp_path / 'cache'
+    write_catalogue(path, 500, seed=1)
+    first = load_index(path, cache_dir)
+    index_path = next(cache_dir.glob('*.index.npz'))
+    built = index_path.stat().st_mtime_ns
+    again = load_index(path, cache_dir)
+    assert index_path.stat().st_mtime_ns == built
+    np.testing.assert_array_equal(again.lookup('gift'), first.lookup('gift'))
+
+    write_catalogue(path, 400, seed=2)
+    rebuilt = load_index(path, cache_dir)
+    assert rebuilt.n_rows == 400
+    assert index_path.stat().st_mtime_ns != built
@@ -0,0 +1,60 @@
+import json
+
+import pandas as pd
+import pytest
+
+from chienchien import ANALYSIS_COLUMNS, iter_records, load_etsy
+
+RECORDS = [
+    {'description': 'Gift box [set of 3], red', 'product_details': 'a\n\n\n\n\n\nb', 'brand': 'Shop]', 'price': 12.5,
+     'category': 'Home', 'average_rating': 4.5, 'reviews_count': 3},
+    {'description': 'escaped \\"] , [{ and ü', 'product_details': None, 'brand': 'Shop,', 'price': 3,
+     'category': 'Art', 'average_rating': None, 'reviews_count': None},
+    {'description': '', 'product_details': '{"nested": [1, 2]}', 'brand': 'Shop', 'price': None,
+     'category': None, 'average_rating': 5.0, 'reviews_count': 0, 'images': ['x', 'y']},
+] * 3
+
+
+def _write(tmp_path, text, name='etsy.json'):
+    path = tmp_path / name
+    path.write_text(text, encoding='utf-8')
+    return path
+
+
+@pytest.mark.parametrize('indent', [None, 2])
+@pytest.mark.parametrize('buffer_size', [1, 2, 7, 64, 1 << 20])
+def test_array_split_across_buffers(tmp_path, indent, buffer_size):
+    path = _write(tmp_path, json.dumps(RECORDS, indent=indent, ensure_ascii=False))
+    assert list(iter_records(path, buffer_size)) == RECORDS
+
+
+def test_json_lines(tmp_path):
+    text = '\n'.join(json.dumps(record) for record in RECORDS)
+    path = _write(tmp_path, '\n' + text.replace('\n', '\n\n', 1) + '\n', 'etsy.jsonl')
+    assert list(iter_records(path)) == RECORDS
+
+
+@pytest.mark.parametrize('text', ['', '  \n', '[]', ' [ \n ] '])
+def test_empty_files(tmp_path, text):
+    path = _write(tmp_path, text)
+    assert list(iter_records(path, buffer_size=2)) == []
+    etsy = load_etsy(path)
+    assert etsy.empty and list(etsy.columns) == list(ANALYSIS_COLUMNS)
+
+
+def test_truncated_array_raises(tmp_path):
+    path = _write(tmp_path, json.dumps(RECORDS)[:-20])
+    with pytest.raises(json.JSONDecodeError):
+        list(iter_records(path, buffer_size=16))
+
+
+def test_chunks_keep_numeric_dtypes(tmp_path):
+    # the first chunk has no rating or review count at all
+    records = [dict(RECORDS[1]) for _ in range(4)] + [dict(RECORDS[0]) for _ in range(4)]
+    path = _write(tmp_path, json.dumps(records))
+    chunked = load_etsy(path, chunksize=4)
+    whole = load_etsy(path, chunksize=100)
+    for column in ('price', 'average_rating', 'reviews_count'):
+        assert chunked[column].dtype == 'float64'
+    pd.testing.assert_frame_equal(chunked, whole, check_dtype=False)
+    assert chunked.index.equals(pd.RangeIndex(len(records)))
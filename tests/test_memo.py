@@ -0,0 +1,46 @@
+import numpy as np
+import pandas as pd
+
+from chienchien import MemoizedEngine, ResultCache, Segment, SegmentEngine, describe_segments
+
+SEGMENTS = (
+    Segment('gift', 'gift'),
+    Segment('gift_paper', 'gift', 'paper'),
+    Segment('paper', 'paper'),
+)
+
+
+def _etsy(n=300):
+    rng = np.random.default_rng(3)
+    words = np.array(['gift', 'paper', 'ink', 'scroll', 'gift paper'])
+    rating = np.round(rng.uniform(1, 5, n), 1)
+    rating[rng.random(n) < 0.2] = np.nan
+    return pd.DataFrame({
+        'description': [' '.join(rng.choice(words, 2)) for _ in range(n)],
+        'product_details': 'ink',
+        'brand': [f'shop{i % 11}' for i in range(n)],
+        'category': rng.choice(['Art', 'Home'], n),
+        'price': np.round(rng.lognormal(3, 1, n), 2),
+        'average_rating': rating,
+        'reviews_count': rng.integers(0, 50, n),
+    })
+
+
+def test_describe_matches_segment_engine():
+    etsy = _etsy()
+    engine = MemoizedEngine(etsy, SEGMENTS)
+    expected = describe_segments(etsy, SegmentEngine(etsy, SEGMENTS).masks())
+    pd.testing.assert_frame_equal(engine.describe(), expected, check_names=False)
+    misses = engine.cache.misses
+    engine.invalidate(SEGMENTS[1])
+    pd.testing.assert_frame_equal(engine.describe(), expected, check_names=False)
+    # only the invalidated segment's mask and statistics are recomputed
+    assert engine.cache.misses == misses + 2
+
+
+def test_eviction_prunes_dependency_links():
+    cache = ResultCache(max_bytes=1)
+    MemoizedEngine(_etsy(), SEGMENTS, cache=cache).tables()
+    assert set(cache._parents) == set(cache._entries)
+    assert all(parent in cache for parent in cache._dependents)
+    assert all(key in cache for keys in cache._dependents.values() for key in keys)
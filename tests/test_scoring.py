@@ -0,0 +1,15 @@
+import numpy as np
+import pandas as pd
+
+from chienchien import add_rating_scores
+
+
+def test_unrated_listings_have_no_score():
+    etsy = pd.DataFrame({
+        'average_rating': [4.8, np.nan, 3.0, np.nan, 5.0],
+        'reviews_count': [120, 0, 2, 15, 0],
+    })
+    score = add_rating_scores(etsy)['rating_score']
+    assert score.isna().tolist() == [False, True, False, True, False]
+    # a rated listing without reviews still falls back to the prior
+    assert np.isfinite(score.iloc[4])
@@ -0,0 +1,102 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from chienchien import add_rating_scores, describe_segments, top_k, top_k_segments
+
+SEGMENTS = ('sparse', 'half', 'dense', 'empty', 'few_rated')
+
+
+@pytest.fixture
+def etsy():
+    rng = np.random.default_rng(7)
+    n = 400
+    rating = np.round(rng.uniform(1, 5, n), 1)
+    rating[rng.random(n) < 0.3] = np.nan
+    price = np.round(rng.lognormal(3, 1, n), 2)
+    price[rng.random(n) < 0.05] = np.nan
+    return pd.DataFrame({
+        'brand': [f'shop{i % 37}' for i in range(n)],
+        'price': price,
+        'category': rng.choice(['Art', 'Home', 'Jewelry'], n),
+        'average_rating': rating,
+        'reviews_count': rng.integers(0, 4, n),
+    })
+
+
+@pytest.fixture
+def masks(etsy):
+    rng = np.random.default_rng(8)
+    n = len(etsy)
+    few_rated = np.zeros(n, dtype=bool)
+    # three rated rows among many unrated ones: fewer than k can be ranked
+    few_rated[np.flatnonzero(etsy['average_rating'].notna())[:3]] = True
+    few_rated[np.flatnonzero(etsy['average_rating'].isna())[:20]] = True
+    return pd.DataFrame({
+        'sparse': rng.random(n) < 0.05,
+        'half': rng.random(n) < 0.5,
+        'dense': rng.random(n) < 0.95,
+        'empty': np.zeros(n, dtype=bool),
+        'few_rated': few_rated,
+    })
+
+
+def _reference_board(etsy, member, k, min_reviews):
+    frame = etsy[member]
+    if min_reviews:
+        frame = frame[frame['reviews_count'] >= min_reviews]
+    frame = frame.dropna(subset=['average_rating', 'reviews_count'])
+    ordered = frame.sort_values(['average_rating', 'reviews_count'], ascending=False, kind='stable')
+    return ordered.head(k)
+
+
+@pytest.mark.parametrize('k', [1, 5, 10])
+@pytest.mark.parametrize('min_reviews', [0, 2])
+def test_top_k_segments_matches_sort_values(etsy, masks, k, min_reviews):
+    board = top_k_segments(etsy, masks, k, min_reviews=min_reviews)
+    for name in SEGMENTS:
+        expected = _reference_board(etsy, masks[name].to_numpy(), k, min_reviews)
+        got = board[board['segment'] == name]
+        assert len(got) <= k
+        assert got.index.tolist() == expected.index.tolist()
+        assert got['rank'].tolist() == list(range(1, len(expected) + 1))
+
+
+def test_top_k_skips_unrated_rows(etsy, masks):
+    frame = etsy[masks['few_rated']]
+    best = top_k(frame, k=10)
+    assert len(best) == 3
+    assert best['average_rating'].notna().all()
+
+
+def test_rating_score_leaderboards_skip_unrated_rows(etsy, masks):
+    # load_cached frames rank by rating_score by default
+    scored = add_rating_scores(etsy)
+    board = top_k_segments(scored, masks, k=10)
+    assert len(board)
+    assert board['average_rating'].notna().all()
+    few = board[board['segment'] == 'few_rated']
+    assert len(few) == 3
+    expected = scored[masks['dense']].dropna(subset=['average_rating'])
+    expected = expected.sort_values(['rating_score', 'reviews_count'], ascending=False, kind='stable').head(10)
+    assert board[board['segment'] == 'dense'].index.tolist() == expected.index.tolist()
+
+
+def test_describe_segments_matches_describe(etsy, masks):
+    table = describe_segments(etsy, masks)
+    columns = ['price', 'average_rating', 'reviews_count']
+    for name in SEGMENTS:
+        expected = etsy.loc[masks[name], columns].astype(float).describe()
+        got = table.xs(name, level='segment').T.rename_axis(columns=None)
+        pd.testing.assert_frame_equal(got, expected, check_names=False)
+
+
+def test_describe_segments_dense_overlap(etsy):
+    # more memberships than rows takes the shared-argsort path
+    rng = np.random.default_rng(9)
+    masks = pd.DataFrame(rng.random((len(etsy), 6)) < 0.7, columns=list('abcdef'))
+    table = describe_segments(etsy, masks, ['price'])
+    for name in masks:
+        expected = etsy.loc[masks[name], ['price']].describe()
+        got = table.xs(name, level='segment').T.rename_axis(columns=None)
+        pd.testing.assert_frame_equal(got, expected, check_names=False)
@@ -0,0 +1,31 @@
+import pytest
+
+from chienchien.snapshots import SnapshotStore
+from chienchien.synthetic import generate_catalogue
+
+pytest.importorskip('pyarrow')
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = SnapshotStore(tmp_path / 'snapshots')
+    scrape = generate_catalogue(300)
+    scrape['scraped_at'] = '2024-01-05T00:00:00'
+    store.append(scrape)
+    return store
+
+
+def test_history_outside_stored_dates_is_empty(store):
+    stored = store.history()
+    empty = store.history(start='2030-01-01')
+    assert empty.empty
+    assert list(empty.columns) == list(stored.columns)
+    assert (empty.dtypes == stored.dtypes).all()
+    assert list(store.history(columns=['price'], end='2020-01-01').columns) == \
+        list(store.history(columns=['price']).columns)
+
+
+def test_trend_outside_stored_dates_is_empty(store):
+    trend = store.trend(start='2030-01-01')
+    assert trend.empty
+    assert list(trend.columns) == list(store.trend().columns)